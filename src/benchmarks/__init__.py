@@ -0,0 +1,25 @@
+##Copyright 2008-2025 Thomas Paviot (tpaviot@gmail.com)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Benchmarks of the wrapper generator. Run them from the src directory:
+#   python -m benchmarks.synthetic_headers  generates an OCCT like include dir
+#   python -m benchmarks.scaling            times generate_wrapper.py on
+#                                           synthetic include dirs
+#   python -m benchmarks.compare            compares the time and memory of
+#                                           the modules with baseline.json
+#   python -m benchmarks.parse_header       parse_header throughput on the
+#                                           configured include dir
+#   python -m benchmarks.adapt_header_file  times the header preprocessing
+#                                           on the configured include dir
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+##Copyright 2008-2025 Thomas Paviot (tpaviot@gmail.com)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Micro-benchmark of adapt_header_file over the headers of the include_dir
+# set in wrapper_generator.conf. The single pass preprocessor is compared
+# with the replace/regex chain it replaced, and both must give the same result.
+# Run it from the src directory, that contains wrapper_generator.conf:
+#   python -m benchmarks.adapt_header_file [--repeat N]
+import argparse
+import logging
+import os
+import re
+import time
+
+import generate_wrapper
+from generate_wrapper import GenerationContext, Registries, adapt_header_file
+
+
+def legacy_adapt_header_file(context, header_content):
+    """The replace/regex chain adapt_header_file used to be"""
+    if ("Deprecated alias to moved class" in header_content) or (
+        "Alias to moved class" in header_content
+    ):
+        return ""
+    outer = re.compile("DEFINE_STANDARD_HANDLE[\\s]*\\([\\w\\s]+\\,+[\\w\\s]+\\)")
+    if matches := outer.findall(header_content):
+        for match in matches:
+            context.standard_handles[match.split("(")[1].split(",")[0]] = None
+    outer = re.compile("DEFINE_STANDARD_RTTIEXT[\\s]*\\([\\w\\s]+\\,+[\\w\\s]+\\)")
+    matches = outer.findall(header_content)
+    for macro, hclass in (
+        ("DEFINE_HARRAY1", context.harray1),
+        ("DEFINE_HARRAY2", context.harray2),
+        ("DEFINE_HSEQUENCE", context.hsequence),
+    ):
+        outer = re.compile(macro + "[\\s]*\\([\\w\\s]+\\,+[\\w\\s]+\\)")
+        if matches := outer.findall(header_content):
+            for match in matches:
+                typename = match.split("(")[1].split(",")[0]
+                base_typename = match.split(",")[1].split(")")[0]
+                hclass[typename] = base_typename.strip()
+    header_content = header_content.replace(
+        "DEFINE_STANDARD_HANDLE", "//DEFINE_STANDARD_HANDLE"
+    )
+    header_content = header_content.replace(
+        "DEFINE_STANDARD_RTTIEXT", "//DEFINE_STANDARD_RTTIEXT"
+    )
+    header_content = header_content.replace(
+        "DEFINE_STANDARD_RTTI_INLINE", "//DEFINE_STANDARD_RTTI_INLINE"
+    )
+    header_content = header_content.replace(
+        "NCOLLECTION_HSEQUENCE", "//NCOLLECTION_HSEQUENCE"
+    )
+    pattern = re.compile(
+        r'Standard_DEPRECATED\s*\(\s*(".*?(?:\\"|[^"])*?"(?:\s*".*?(?:\\"|[^"])*?")*)\s*\)'
+    )
+    if matches := pattern.findall(header_content):
+        for match in matches:
+            header_content = header_content.replace(match, "//DEPRECATION_WARNING")
+    header_content = header_content.replace(
+        "Standard_DEPRECATED", "//Standard_DEPRECATED"
+    )
+    header_content = header_content.replace(
+        "DECLARE_TOBJOCAF_PERSISTENCE", "//DECLARE_TOBJOCAF_PERSISTENCE"
+    )
+    header_content = header_content.replace(
+        "DEFINE_DERIVED_ATTRIBUTE", "//DEFINE_DERIVED_ATTRIBUTE"
+    )
+    header_content = header_content.replace("DEFINE_STANDARD_ALLOC", "")
+    header_content = header_content.replace("Standard_EXPORT", "")
+    header_content = header_content.replace("Standard_NODISCARD", "")
+    outer = re.compile("Handle[\\s]*\\([\\w\\s]*\\)")
+    if matches := outer.findall(header_content):
+        for match in matches:
+            match = match.replace(" ", "")
+            class_name = (match.split("Handle(")[1]).split(")")[0]
+            if class_name == "" or not class_name[0].isupper():
+                continue
+            header_content = header_content.replace(
+                match, f"opencascade::handle<{class_name}>"
+            )
+    return header_content
+
+
+def run(adapt_function, header_contents, repeat):
+    """Returns the best time over repeat runs, and the results of the last one"""
+    best_time = None
+    for _ in range(repeat):
+        results = []
+        start = time.perf_counter()
+        for header_content in header_contents:
+            context = GenerationContext("Standard", Registries())
+            adapted_header_content = adapt_function(context, header_content)
+            results.append((adapted_header_content, context.get_header_definitions()))
+        elapsed = time.perf_counter() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+    return best_time, results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare adapt_header_file with the replace/regex chain"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs")
+    args = parser.parse_args()
+    # the "Found HARRAY1 definition" lines are not part of the benchmark
+    logging.disable(logging.INFO)
+
+    header_contents = []
+    with os.scandir(generate_wrapper.OCCT_INCLUDE_DIR) as dir_entries:
+        for dir_entry in sorted(dir_entries, key=lambda entry: entry.name):
+            if dir_entry.name.endswith(".hxx"):
+                with open(dir_entry.path, "r", encoding="utf-8") as header_file:
+                    header_contents.append(header_file.read())
+    nb_bytes = sum(len(header_content) for header_content in header_contents)
+    print(f"{len(header_contents)} headers, {nb_bytes / 1e6:.1f} MB")
+
+    legacy_time, legacy_results = run(
+        legacy_adapt_header_file, header_contents, args.repeat
+    )
+    new_time, new_results = run(adapt_header_file, header_contents, args.repeat)
+    nb_differences = sum(
+        legacy_result != new_result
+        for legacy_result, new_result in zip(legacy_results, new_results)
+    )
+    print(f"replace/regex chain : {legacy_time:.3f}s")
+    print(f"single pass         : {new_time:.3f}s")
+    print(f"speedup             : {legacy_time / new_time:.2f}x")
+    print(f"different results   : {nb_differences}")
@@ -0,0 +1,278 @@
+##Copyright 2008-2025 Thomas Paviot (tpaviot@gmail.com)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Performance regression check. generate_wrapper.py is run on a fixed synthetic
+# include dir, and what the run does is compared with the baseline.json file of
+# this directory: the traced peak memory and the compile weight of each module,
+# and the lookups, misses and evictions of the registries and caches. These do
+# not depend on the machine or its load. Exits with status 1 if they exceed the
+# baseline tolerances. Timings are only given for information, relative to the
+# time of a calibration workload measured on the same machine:
+#   python -m benchmarks.compare
+# Record the baseline again once a change is accepted:
+#   python -m benchmarks.compare --update
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import CppHeaderParser
+
+from benchmarks.scaling import run_generator
+from benchmarks.synthetic_headers import generate_headers
+
+BASELINE_FILENAME = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+# the fixed corpus, changing it requires to record the baseline again
+CORPUS = {
+    "nb_headers": 400,
+    "headers_per_module": 20,
+    "inheritance_depth": 6,
+    "seed": 0,
+}
+
+# relative increases allowed, recorded in the baseline
+DEFAULT_TOLERANCES = {"memory": 0.1, "compile_weight": 0.0, "counters": 0.0}
+
+# memory differences smaller than this are noise, whatever the tolerance
+MIN_MEMORY_DIFFERENCE = 0.05  # MB
+
+# the counter events that measure the work done
+COUNTER_EVENTS = ["lookups", "misses", "evictions"]
+
+# the header parsed by the calibration workload, CALIBRATION_SIZE times
+CALIBRATION_HEADER = """
+class gp_Pnt
+{
+public:
+  gp_Pnt();
+  gp_Pnt(const Standard_Real theXp, const Standard_Real theYp, const Standard_Real theZp);
+  void SetCoord(const Standard_Integer theIndex, const Standard_Real theXi);
+  Standard_Real Distance(const gp_Pnt& theOther) const;
+  void Mirror(const gp_Pnt& theP);
+  gp_Pnt Mirrored(const gp_Pnt& theP) const;
+  void Transform(const gp_Trsf& theT);
+  const gp_XYZ& XYZ() const;
+private:
+  gp_XYZ coord;
+};
+"""
+CALIBRATION_SIZE = 50
+
+
+def calibrate(repeat):
+    """The time of a fixed workload, parsing a header with CppHeaderParser,
+    the fastest of repeat runs. The generator timings divided by this time
+    can be compared between machines
+    """
+    calibration_time = float("inf")
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        for _ in range(CALIBRATION_SIZE):
+            CppHeaderParser.CppHeader(CALIBRATION_HEADER, "string")
+        calibration_time = min(calibration_time, time.perf_counter() - start_time)
+    return calibration_time
+
+
+def get_counters(report):
+    """The counter events of COUNTER_EVENTS of the report"""
+    counters = {}
+    for name, counter in report["counters"].items():
+        events = {
+            "lookups": counter.get("hits", 0) + counter.get("misses", 0),
+            "misses": counter.get("misses", 0),
+            "evictions": counter.get("evictions", 0),
+        }
+        counters[name] = {event: value for event, value in events.items() if value}
+    return counters
+
+
+def measure(work_dir, repeat):
+    """Run the generator repeat times on the corpus, and once more with
+    the memory allocations traced, as tracing slows the generation down.
+    Returns the calibration time, the minimum time, the traced peak memory
+    and the compile weight of each module, and the counters of the run
+    """
+    include_dir = os.path.join(work_dir, "include")
+    modules = generate_headers(
+        include_dir,
+        CORPUS["nb_headers"],
+        CORPUS["headers_per_module"],
+        CORPUS["inheritance_depth"],
+        CORPUS["seed"],
+    )
+    measures = {}
+    for run in range(repeat):
+        run_dir = os.path.join(work_dir, f"run-{run}")
+        os.makedirs(run_dir)
+        _, report = run_generator(run_dir, include_dir, modules, 1)
+        for module_name, module_entry in report["modules"].items():
+            module_measures = measures.setdefault(module_name, {"time": float("inf")})
+            module_measures["time"] = min(
+                module_measures["time"], module_entry["total"]
+            )
+            module_measures["compile_weight"] = module_entry["compile_cost"][
+                "compile_weight"
+            ]
+    counters = get_counters(report)
+    run_dir = os.path.join(work_dir, "run-memory")
+    os.makedirs(run_dir)
+    _, report = run_generator(run_dir, include_dir, modules, 1, ["--memory"])
+    for module_name, module_entry in report["modules"].items():
+        measures[module_name]["memory"] = module_entry["memory"]["traced_peak"]
+    return calibrate(repeat), measures, counters
+
+
+def is_regression(value, baseline_value, tolerance, min_difference=0):
+    return (
+        value > baseline_value * (1 + tolerance)
+        and value - baseline_value > min_difference
+    )
+
+
+def compare(baseline, calibration, measures, counters, tolerances):
+    """Returns the regressions of measures and counters compared to the
+    baseline, as a list of messages. The timings are printed
+    """
+    regressions = []
+    for module_name, baseline_measures in baseline["modules"].items():
+        if module_name not in measures:
+            regressions.append(f"{module_name}: not processed")
+            continue
+        for name, min_difference in [
+            ("memory", MIN_MEMORY_DIFFERENCE),
+            ("compile_weight", 0),
+        ]:
+            value = measures[module_name][name]
+            baseline_value = baseline_measures[name]
+            if is_regression(value, baseline_value, tolerances[name], min_difference):
+                regressions.append(
+                    f"{module_name}: {name} {value:.4f} > {baseline_value:.4f} "
+                    f"(+{100 * (value / baseline_value - 1):.0f}%, "
+                    f"tolerance {100 * tolerances[name]:.0f}%)"
+                )
+    for name, baseline_events in baseline["counters"].items():
+        for event, baseline_value in baseline_events.items():
+            value = counters.get(name, {}).get(event, 0)
+            if is_regression(value, baseline_value, tolerances["counters"]):
+                regressions.append(
+                    f"{name}: {event} {value} > {baseline_value} "
+                    f"(tolerance {100 * tolerances['counters']:.0f}%)"
+                )
+    for name, events in counters.items():
+        for event, value in events.items():
+            if event not in baseline["counters"].get(name, {}):
+                regressions.append(f"{name}: {event} {value}, not in the baseline")
+    for name in ["memory", "compile_weight"]:
+        baseline_total = sum(entry[name] for entry in baseline["modules"].values())
+        total = sum(
+            measures[module_name][name]
+            for module_name in baseline["modules"]
+            if module_name in measures
+        )
+        print(
+            f"total {name}: {total:.4f}, baseline {baseline_total:.4f} "
+            f"({100 * (total / baseline_total - 1):+.1f}%)"
+        )
+    # for information, the timings depend on the machine and its load
+    baseline_time = sum(entry["time"] for entry in baseline["modules"].values())
+    total_time = sum(
+        measures[module_name]["time"]
+        for module_name in baseline["modules"]
+        if module_name in measures
+    )
+    relative_time = total_time / calibration
+    baseline_relative_time = baseline_time / baseline["calibration"]
+    print(
+        f"total time: {total_time:.4f}s, baseline {baseline_time:.4f}s, "
+        f"{relative_time:.2f} calibrations, baseline {baseline_relative_time:.2f} "
+        f"({100 * (relative_time / baseline_relative_time - 1):+.1f}%, "
+        "not checked)"
+    )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the memory, compile weight and counters of "
+        "generate_wrapper.py with a baseline"
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="record the baseline instead of comparing with it",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=BASELINE_FILENAME,
+        help="the baseline JSON file, benchmarks/baseline.json by default",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of timed runs and calibrations, the fastest is kept, "
+        "3 by default",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        help="relative memory increase allowed, overrides the baseline tolerance",
+    )
+    args = parser.parse_args()
+    work_dir = tempfile.mkdtemp(prefix="generator-compare-")
+    try:
+        calibration, measures, counters = measure(work_dir, args.repeat)
+    finally:
+        shutil.rmtree(work_dir)
+    if args.update:
+        tolerances = dict(DEFAULT_TOLERANCES)
+        if args.memory_tolerance is not None:
+            tolerances["memory"] = args.memory_tolerance
+        with open(args.baseline, "w", encoding="utf8") as baseline_file:
+            json.dump(
+                {
+                    "corpus": CORPUS,
+                    "tolerances": tolerances,
+                    "calibration": calibration,
+                    "modules": measures,
+                    "counters": counters,
+                },
+                baseline_file,
+                indent=2,
+            )
+            baseline_file.write("\n")
+        print(f"Baseline of {len(measures)} modules written to {args.baseline}")
+        sys.exit(0)
+    with open(args.baseline, "r", encoding="utf8") as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline["corpus"] != CORPUS:
+        sys.exit("The baseline was recorded on another corpus, record it again")
+    if "counters" not in baseline:
+        sys.exit("The baseline was recorded by a previous version, record it again")
+    tolerances = dict(baseline["tolerances"])
+    if args.memory_tolerance is not None:
+        tolerances["memory"] = args.memory_tolerance
+    regressions = compare(baseline, calibration, measures, counters, tolerances)
+    for regression in regressions:
+        print(regression)
+    if regressions:
+        sys.exit(f"{len(regressions)} regressions")
+    print("No regression")
@@ -0,0 +1,161 @@
+##Copyright 2008-2025 Thomas Paviot (tpaviot@gmail.com)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Throughput of parse_header over the headers the generator parses, in the
+# include_dir set in wrapper_generator.conf. The headers are parsed with an
+# empty parse cache (cold), then with the cache filled by the first pass (warm).
+# The cold times do not include the cache writes, given as the parse_cache
+# stage. The slowest headers of the cold pass are listed with their size.
+# Run it from the src directory, that contains wrapper_generator.conf:
+#   python -m benchmarks.parse_header [--top 50] [--modules gp Geom]
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import generate_wrapper
+from generate_wrapper import (
+    GenerationContext,
+    ModuleMeasures,
+    ParseCache,
+    Registries,
+    get_all_modules,
+    get_include_dir_index,
+    parse_header,
+    set_parse_cache,
+)
+
+
+def get_headers_to_parse(modules):
+    """The headers parsed by the generator for these modules, with
+    the module they are parsed for
+    """
+    include_dir_index = get_include_dir_index()
+    return [
+        (module_name, header_filename)
+        for module_name in modules
+        for header_filename in include_dir_index.get_headers_to_parse(module_name)
+    ]
+
+
+def run(headers, count_cache):
+    """Parse the headers once. Returns the time of each header, the
+    stage timings and the headers that could not be parsed. The time
+    spent in the parse cache is not in the header times unless count_cache
+    """
+    header_times = {}
+    timings = {}
+    errors = []
+    for module_name, header_filename in headers:
+        context = GenerationContext(module_name, Registries())
+        measures = ModuleMeasures(module_name)
+        start = time.perf_counter()
+        try:
+            parse_header(context, header_filename, measures)
+        except RuntimeError:
+            errors.append(header_filename)
+            continue
+        header_times[header_filename] = time.perf_counter() - start
+        if not count_cache:
+            header_times[header_filename] -= measures.timings.get("parse_cache", 0.0)
+        for stage, stage_time in measures.timings.items():
+            timings[stage] = timings.get(stage, 0.0) + stage_time
+    return header_times, timings, errors
+
+
+def get_throughput(header_times, header_sizes):
+    total_time = sum(header_times.values())
+    nb_bytes = sum(header_sizes[header] for header in header_times)
+    return {
+        "time": total_time,
+        "headers_per_second": len(header_times) / total_time,
+        "bytes_per_second": nb_bytes / total_time,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time parse_header over all headers")
+    parser.add_argument(
+        "--modules", nargs="+", help="modules to parse, all modules by default"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=50,
+        help="number of slowest headers listed, 50 by default",
+    )
+    parser.add_argument(
+        "--output", help="write the results to this JSON file, with all header times"
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    headers = get_headers_to_parse(args.modules or get_all_modules())
+    header_sizes = {
+        header_filename: os.path.getsize(header_filename)
+        for _, header_filename in headers
+    }
+    nb_bytes = sum(header_sizes.values())
+    print(
+        f"{len(headers)} headers, {nb_bytes / 1e6:.1f} MB "
+        f"in {generate_wrapper.OCCT_INCLUDE_DIR}"
+    )
+
+    cache_dir = tempfile.mkdtemp(prefix="generator-parse-cache-")
+    try:
+        set_parse_cache(ParseCache(cache_dir, max_size=1024))
+        results = {}
+        for cache_state in ("cold", "warm"):
+            header_times, timings, errors = run(headers, cache_state == "warm")
+            results[cache_state] = {
+                **get_throughput(header_times, header_sizes),
+                "stages": timings,
+                "errors": errors,
+                "headers": header_times,
+            }
+    finally:
+        shutil.rmtree(cache_dir)
+
+    for cache_state, result in results.items():
+        print(
+            f"{cache_state} cache: {result['time']:.2f}s, "
+            f"{result['headers_per_second']:.1f} headers/s, "
+            f"{result['bytes_per_second'] / 1e6:.2f} MB/s"
+        )
+        for stage, stage_time in sorted(
+            result["stages"].items(), key=lambda item: item[1], reverse=True
+        ):
+            print(f"    {stage:<20} {stage_time:.2f}s")
+        for header_filename in result["errors"]:
+            print(f"    cannot parse {header_filename}")
+    cold_header_times = results["cold"]["headers"]
+    warm_header_times = results["warm"]["headers"]
+    print(f"\n{args.top} slowest headers, cold cache:")
+    print(f"{'header':<50} {'KB':>8} {'cold (ms)':>10} {'warm (ms)':>10}")
+    for header_filename in sorted(
+        cold_header_times, key=cold_header_times.get, reverse=True
+    )[: args.top]:
+        print(
+            f"{os.path.basename(header_filename):<50} "
+            f"{header_sizes[header_filename] / 1024:>8.1f} "
+            f"{1000 * cold_header_times[header_filename]:>10.2f} "
+            f"{1000 * warm_header_times.get(header_filename, 0.0):>10.2f}"
+        )
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf8") as output_file:
+            json.dump(results, output_file, indent=2)
@@ -0,0 +1,160 @@
+##Copyright 2008-2025 Thomas Paviot (tpaviot@gmail.com)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Times a full generate_wrapper.py run (no parse cache, all modules processed)
+# on synthetic include dirs of several sizes, with several numbers of worker
+# processes. Each run has its own configuration file and output directory,
+# in a temporary directory:
+#   python -m benchmarks.scaling --sizes 100 1000 10000 50000 --jobs 1 2 4 8
+import argparse
+import configparser
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_headers import generate_headers
+
+GENERATE_WRAPPER = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "generate_wrapper.py"
+)
+
+
+def run_generator(run_dir, include_dir, modules, jobs, extra_args=()):
+    """Run generate_wrapper.py in run_dir, with the extra_args command
+    line options. Returns the wall time and the generator report
+    """
+    pythonocc_core_path = os.path.join(run_dir, "pythonocc-core")
+    swig_files_path = os.path.join(pythonocc_core_path, "src", "SWIG_files")
+    for output_dir in ("wrapper", "common", "headers"):
+        os.makedirs(os.path.join(swig_files_path, output_dir), exist_ok=True)
+    config = configparser.ConfigParser()
+    config["OCCT"] = {"include_dir": include_dir}
+    config["pythonocc-core"] = {"version": "7.9.0", "path": pythonocc_core_path}
+    config["build"] = {"parallel_build": "False"}
+    with open(
+        os.path.join(run_dir, "wrapper_generator.conf"), "w", encoding="utf8"
+    ) as config_file:
+        config.write(config_file)
+    command = [GENERATE_WRAPPER, "--jobs", str(jobs), "--force", "--no-cache"]
+    command += extra_args
+    start_time = time.perf_counter()
+    # the output is in generator.log
+    subprocess.run(
+        [sys.executable] + command + modules,
+        cwd=run_dir,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    wall_time = time.perf_counter() - start_time
+    report_filename = os.path.join(swig_files_path, "wrapper", "generator_report.json")
+    with open(report_filename, "r", encoding="utf8") as report_file:
+        report = json.load(report_file)
+    return wall_time, report
+
+
+def run_benchmark(work_dir, sizes, jobs_list, headers_per_module, inheritance_depth):
+    results = []
+    for nb_headers in sizes:
+        include_dir = os.path.join(work_dir, f"{nb_headers}", "include")
+        modules = generate_headers(
+            include_dir, nb_headers, headers_per_module, inheritance_depth
+        )
+        serial_time = None
+        for jobs in jobs_list:
+            run_dir = os.path.join(work_dir, f"{nb_headers}", f"jobs-{jobs}")
+            os.makedirs(run_dir, exist_ok=True)
+            wall_time, report = run_generator(run_dir, include_dir, modules, jobs)
+            if jobs == 1:
+                serial_time = wall_time
+            result = {
+                "headers": nb_headers,
+                "modules": len(modules),
+                "jobs": jobs,
+                "wall_time": wall_time,
+                "headers_per_second": nb_headers / wall_time,
+                "speedup": serial_time / wall_time if serial_time else None,
+                "stages": report["stages"],
+            }
+            results.append(result)
+            speedup = f"{result['speedup']:.2f}x" if result["speedup"] else "-"
+            print(
+                f"{nb_headers:>8} {len(modules):>8} {jobs:>5} {wall_time:>10.2f}s "
+                f"{result['headers_per_second']:>10.1f} {speedup:>8}",
+                flush=True,
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time generate_wrapper.py on synthetic include dirs"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000],
+        help="numbers of headers, 100 1000 10000 by default",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count()}),
+        help="numbers of worker processes, 1 2 4 and the number of cpus by default",
+    )
+    parser.add_argument(
+        "--headers-per-module",
+        type=int,
+        default=50,
+        help="number of headers of a module, 50 by default",
+    )
+    parser.add_argument(
+        "--inheritance-depth",
+        type=int,
+        default=6,
+        help="length of the chains of transient classes, 6 by default",
+    )
+    parser.add_argument(
+        "--output", help="write the results to this JSON file, with the stage timings"
+    )
+    parser.add_argument(
+        "--work-dir",
+        help="directory of the include dirs and runs, kept after the benchmark. "
+        "A temporary directory is used by default",
+    )
+    args = parser.parse_args()
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="generator-scaling-")
+    print(
+        f"{'headers':>8} {'modules':>8} {'jobs':>5} {'time':>11} {'headers/s':>10} {'speedup':>8}"
+    )
+    try:
+        results = run_benchmark(
+            work_dir,
+            args.sizes,
+            args.jobs,
+            args.headers_per_module,
+            args.inheritance_depth,
+        )
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir)
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf8") as output_file:
+            json.dump(results, output_file, indent=2)
@@ -0,0 +1,404 @@
+##Copyright 2008-2025 Thomas Paviot (tpaviot@gmail.com)
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# Generates a synthetic include directory, written in the OCCT style, so that
+# the wrapper generator can be benchmarked without an OCCT install.
+# The headers are spread over the modules of Modules.py, each module gets
+# transient classes with deep inheritance (DEFINE_STANDARD_HANDLE, Handle(...)),
+# value classes, enums, NCollection typedefs and DEFINE_HARRAY1 classes:
+#   python -m benchmarks.synthetic_headers INCLUDE_DIR --headers 1000
+import argparse
+import os
+import random
+from string import Template
+
+from Modules import OCCT_MODULES
+
+# The Standard headers the synthetic classes rely on, the other
+# FOUNDATION_EMPTY_HEADERS only have an include guard
+FOUNDATION_HEADERS = {
+    "Standard": """// Created by benchmarks.synthetic_headers
+#ifndef _Standard_HeaderFile
+#define _Standard_HeaderFile
+
+//! The package Standard provides global memory allocator and other basic
+//! services used by other OCCT components.
+class Standard
+{
+public:
+  DEFINE_STANDARD_ALLOC
+
+  //! Allocates memory blocks
+  Standard_EXPORT static Standard_Address Allocate(const Standard_Size aSize);
+
+  //! Deallocates memory blocks
+  Standard_EXPORT static void Free(const Standard_Address thePtr);
+};
+
+#endif // _Standard_HeaderFile
+""",
+    "Standard_Transient": """// Created by benchmarks.synthetic_headers
+#ifndef _Standard_Transient_HeaderFile
+#define _Standard_Transient_HeaderFile
+
+#include <Standard.hxx>
+
+//! Abstract class which forms the root of the entire
+//! Transient class hierarchy.
+class Standard_Transient
+{
+public:
+  DEFINE_STANDARD_ALLOC
+
+  //! Empty constructor
+  Standard_Transient() : myRefCount_(0) {}
+
+  //! Destructor must be virtual
+  virtual ~Standard_Transient() {}
+
+  //! Returns true if this is an instance of theType.
+  Standard_EXPORT Standard_Boolean IsInstance(const Handle(Standard_Type)& theType) const;
+
+  //! Get the reference counter of this object
+  Standard_EXPORT Standard_Integer GetRefCount() const;
+
+private:
+  Standard_Integer myRefCount_;
+};
+
+#endif // _Standard_Transient_HeaderFile
+""",
+    "Standard_Type": """// Created by benchmarks.synthetic_headers
+#ifndef _Standard_Type_HeaderFile
+#define _Standard_Type_HeaderFile
+
+#include <Standard_Transient.hxx>
+
+class Standard_Type;
+DEFINE_STANDARD_HANDLE(Standard_Type, Standard_Transient)
+
+//! This class provides legacy interface (type descriptor) to run-time type
+//! information (RTTI) for OCCT classes inheriting from Standard_Transient.
+class Standard_Type : public Standard_Transient
+{
+public:
+  //! Returns the system type name of the class (typeinfo.name)
+  Standard_CString SystemName() const { return mySystemName; }
+
+  //! Returns the given name of the class type (get_type_name)
+  Standard_CString Name() const { return myName; }
+
+  DEFINE_STANDARD_RTTIEXT(Standard_Type, Standard_Transient)
+
+private:
+  Standard_CString mySystemName;
+  Standard_CString myName;
+};
+
+#endif // _Standard_Type_HeaderFile
+""",
+}
+FOUNDATION_EMPTY_HEADERS = (
+    "Standard_Address",
+    "Standard_Boolean",
+    "Standard_DefineAlloc",
+    "Standard_Integer",
+    "Standard_Macro",
+    "Standard_OStream",
+    "Standard_Real",
+    "Standard_TypeDef",
+    "Standard_WarningsDisable",
+    "Standard_WarningsRestore",
+)
+EMPTY_HEADER_TEMPLATE = Template(
+    """// Created by benchmarks.synthetic_headers
+#ifndef _${HEADER}_HeaderFile
+#define _${HEADER}_HeaderFile
+#endif // _${HEADER}_HeaderFile
+"""
+)
+
+# the kind of each header of a group of ten headers of a module
+HEADER_KINDS = (
+    "transient_class",
+    "transient_class",
+    "transient_class",
+    "value_class",
+    "transient_class",
+    "transient_class",
+    "enum",
+    "transient_class",
+    "typedefs",
+    "harray1",
+)
+
+TRANSIENT_CLASS_TEMPLATE = Template(
+    """// Created by benchmarks.synthetic_headers
+#ifndef _${CLASS}_HeaderFile
+#define _${CLASS}_HeaderFile
+
+#include <Standard.hxx>
+#include <Standard_Type.hxx>
+#include <${BASE}.hxx>
+
+class ${CLASS};
+DEFINE_STANDARD_HANDLE(${CLASS}, ${BASE})
+
+//! ${CLASS} is a synthetic transient class, that inherits ${BASE}.
+class ${CLASS} : public ${BASE}
+{
+public:
+  //! Creates a default ${CLASS}.
+  Standard_EXPORT ${CLASS}();
+
+  //! Creates a ${CLASS} from a value and another object.
+  Standard_EXPORT ${CLASS}(const Standard_Real theValue, const Handle(${BASE})& theOther);
+${METHODS}
+  DEFINE_STANDARD_RTTIEXT(${CLASS}, ${BASE})
+
+protected:
+  Standard_Real myValue;
+  Handle(${BASE}) myOther;
+};
+
+#endif // _${CLASS}_HeaderFile
+"""
+)
+
+VALUE_CLASS_TEMPLATE = Template(
+    """// Created by benchmarks.synthetic_headers
+#ifndef _${CLASS}_HeaderFile
+#define _${CLASS}_HeaderFile
+
+#include <Standard.hxx>
+#include <Standard_DefineAlloc.hxx>
+
+//! ${CLASS} is a synthetic value class.
+class ${CLASS}
+{
+public:
+  DEFINE_STANDARD_ALLOC
+
+  //! Creates a default ${CLASS}.
+  Standard_EXPORT ${CLASS}();
+${METHODS}
+private:
+  Standard_Real myValue;
+  Standard_Integer myIndex;
+};
+
+#endif // _${CLASS}_HeaderFile
+"""
+)
+
+ENUM_TEMPLATE = Template(
+    """// Created by benchmarks.synthetic_headers
+#ifndef _${ENUM}_HeaderFile
+#define _${ENUM}_HeaderFile
+
+//! ${ENUM} is a synthetic enumeration.
+enum ${ENUM}
+{
+${VALUES}
+};
+
+#endif // _${ENUM}_HeaderFile
+"""
+)
+
+TYPEDEFS_TEMPLATE = Template(
+    """// Created by benchmarks.synthetic_headers
+#ifndef _${MODULE}_Array1Of${CLASS_SUFFIX}_HeaderFile
+#define _${MODULE}_Array1Of${CLASS_SUFFIX}_HeaderFile
+
+#include <${CLASS}.hxx>
+#include <NCollection_Array1.hxx>
+#include <NCollection_Sequence.hxx>
+
+typedef NCollection_Array1<Handle(${CLASS})> ${MODULE}_Array1Of${CLASS_SUFFIX};
+typedef NCollection_Sequence<Handle(${CLASS})> ${MODULE}_SequenceOf${CLASS_SUFFIX};
+
+#endif // _${MODULE}_Array1Of${CLASS_SUFFIX}_HeaderFile
+"""
+)
+
+HARRAY1_TEMPLATE = Template(
+    """// Created by benchmarks.synthetic_headers
+#ifndef _${MODULE}_HArray1Of${CLASS_SUFFIX}_HeaderFile
+#define _${MODULE}_HArray1Of${CLASS_SUFFIX}_HeaderFile
+
+#include <${MODULE}_Array1Of${CLASS_SUFFIX}.hxx>
+#include <NCollection_DefineHArray1.hxx>
+
+DEFINE_HARRAY1(${MODULE}_HArray1Of${CLASS_SUFFIX}, ${MODULE}_Array1Of${CLASS_SUFFIX})
+
+#endif // _${MODULE}_HArray1Of${CLASS_SUFFIX}_HeaderFile
+"""
+)
+
+
+def get_method_declarations(rng, class_name, base_name, enum_name):
+    """A random set of method declarations: getters, setters, overloads,
+    static methods, methods that use handles and the module enum
+    """
+    declarations = []
+    for method_index in range(rng.randint(3, 12)):
+        method_kind = rng.randrange(6)
+        if method_kind == 0:
+            declaration = f"Standard_Real Value{method_index}(const Standard_Integer theIndex) const;"
+        elif method_kind == 1:
+            declaration = (
+                f"void SetValue{method_index}(const Standard_Real theValue);\n"
+                f"  Standard_EXPORT void SetValue{method_index}"
+                "(const Standard_Real theValue, const Standard_Boolean theToCheck);"
+            )
+        elif method_kind == 2 and base_name is not None:
+            declaration = f"Handle({base_name}) Other{method_index}() const;"
+        elif method_kind == 3 and enum_name is not None:
+            declaration = f"void SetMode{method_index}(const {enum_name} theMode);"
+        elif method_kind == 4:
+            declaration = f"static Standard_Boolean IsValid{method_index}(const Standard_Real theValue);"
+        else:
+            declaration = f"virtual Standard_Integer NbItems{method_index}() const;"
+        declarations.append(
+            f"\n  //! Synthetic method {method_index} of {class_name}.\n"
+            f"  Standard_EXPORT {declaration}\n"
+        )
+    return "".join(declarations)
+
+
+def get_module_headers(module_name, nb_headers, inheritance_depth, rng):
+    """Returns the header names and contents of a module"""
+    headers = {}
+    # the transient classes of the module, in creation order
+    transient_classes = []
+    enum_name = None
+    # the Array1 typedef of the harray1 classes
+    array1_class = None
+    for header_index in range(nb_headers):
+        header_kind = HEADER_KINDS[header_index % len(HEADER_KINDS)]
+        if header_kind == "transient_class":
+            class_name = f"{module_name}_Class{header_index}"
+            # chains of inheritance_depth classes
+            if len(transient_classes) % inheritance_depth == 0:
+                base_name = "Standard_Transient"
+            else:
+                base_name = transient_classes[-1]
+            transient_classes.append(class_name)
+            methods = get_method_declarations(rng, class_name, base_name, enum_name)
+            headers[class_name] = TRANSIENT_CLASS_TEMPLATE.substitute(
+                CLASS=class_name, BASE=base_name, METHODS=methods
+            )
+        elif header_kind == "value_class":
+            class_name = f"{module_name}_Value{header_index}"
+            methods = get_method_declarations(rng, class_name, None, enum_name)
+            headers[class_name] = VALUE_CLASS_TEMPLATE.substitute(
+                CLASS=class_name, METHODS=methods
+            )
+        elif header_kind == "enum":
+            enum_name = f"{module_name}_Enum{header_index}"
+            values = ",\n".join(
+                f"  {enum_name}_Value{value_index}"
+                for value_index in range(rng.randint(2, 8))
+            )
+            headers[enum_name] = ENUM_TEMPLATE.substitute(ENUM=enum_name, VALUES=values)
+        elif header_kind == "typedefs":
+            array1_class = transient_classes[-1]
+            class_suffix = array1_class[len(module_name) + 1 :]
+            headers[
+                f"{module_name}_Array1Of{class_suffix}"
+            ] = TYPEDEFS_TEMPLATE.substitute(
+                MODULE=module_name, CLASS=array1_class, CLASS_SUFFIX=class_suffix
+            )
+        elif header_kind == "harray1":
+            class_suffix = array1_class[len(module_name) + 1 :]
+            headers[
+                f"{module_name}_HArray1Of{class_suffix}"
+            ] = HARRAY1_TEMPLATE.substitute(
+                MODULE=module_name, CLASS_SUFFIX=class_suffix
+            )
+    return headers
+
+
+def generate_headers(
+    include_dir, nb_headers, headers_per_module=50, inheritance_depth=6, seed=0
+):
+    """Write nb_headers headers to include_dir, spread over the modules of
+    Modules.py whose classes are wrapped, with about headers_per_module headers each, and the
+    Standard headers they rely on.
+    Returns the names of the modules that have headers
+    """
+    rng = random.Random(seed)
+    # the modules whose classes are wrapped
+    module_names = [module[0] for module in OCCT_MODULES if "*" not in module[2]]
+    nb_modules = min(len(module_names), max(1, -(-nb_headers // headers_per_module)))
+    module_names = module_names[:nb_modules]
+    os.makedirs(include_dir, exist_ok=True)
+    foundation_headers = FOUNDATION_HEADERS | {
+        header_name: EMPTY_HEADER_TEMPLATE.substitute(HEADER=header_name)
+        for header_name in FOUNDATION_EMPTY_HEADERS
+    }
+    for header_name, header_content in foundation_headers.items():
+        header_filename = os.path.join(include_dir, f"{header_name}.hxx")
+        with open(header_filename, "w", encoding="utf-8") as header_file:
+            header_file.write(header_content)
+    for module_index, module_name in enumerate(module_names):
+        # the first modules get one more header if the division is not exact
+        nb_module_headers = nb_headers // nb_modules + (
+            module_index < nb_headers % nb_modules
+        )
+        headers = get_module_headers(
+            module_name, nb_module_headers, inheritance_depth, rng
+        )
+        for header_name, header_content in headers.items():
+            header_filename = os.path.join(include_dir, f"{header_name}.hxx")
+            with open(header_filename, "w", encoding="utf-8") as header_file:
+                header_file.write(header_content)
+    if "Standard" not in module_names:
+        module_names.append("Standard")
+    return module_names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic OCCT like include directory"
+    )
+    parser.add_argument("include_dir", help="the directory the headers are written to")
+    parser.add_argument(
+        "--headers", type=int, default=1000, help="number of headers, 1000 by default"
+    )
+    parser.add_argument(
+        "--headers-per-module",
+        type=int,
+        default=50,
+        help="number of headers of a module, 50 by default",
+    )
+    parser.add_argument(
+        "--inheritance-depth",
+        type=int,
+        default=6,
+        help="length of the chains of transient classes, 6 by default",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+    modules = generate_headers(
+        args.include_dir,
+        args.headers,
+        args.headers_per_module,
+        args.inheritance_depth,
+        args.seed,
+    )
+    print(f"{args.headers} module headers written to {args.include_dir}")
+    print(f"modules: {' '.join(modules)}")
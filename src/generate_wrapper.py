@@ -17,20 +17,49 @@
 ###########
 # imports #
 ###########
+import argparse
+import atexit
+from collections import Counter, OrderedDict, deque, namedtuple
 import configparser
+import contextlib
+import copyreg
+import cProfile
 import datetime
-import glob
+import functools
+import gc
 import hashlib  # to compute md5 function signatures
+import inspect
+import io
 import keyword  # to prevent using python language keywords
 import logging
+import logging.handlers
+import itertools
+import json
 from operator import itemgetter
+import multiprocessing
+from multiprocessing.pool import ExceptionWithTraceback
 import os
+import pickle
 import platform
+import pstats
+import queue
 import re
+import shutil
+import signal
 from string import Template
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+from types import MappingProxyType
+import tracemalloc
+import zlib
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 import CppHeaderParser
 
@@ -65,24 +94,176 @@ GENERATE_SWIG_FILES = (
     True  # if set to False, skip .i generator, to avoid recompile everything
 )
 
+# generate wrappers with all available cores, can be overridden
+# with the --jobs command line option
+PARALLEL_BUILD = config.getboolean("build", "parallel_build", fallback=False)
+
+# parsed headers are cached in this directory, up to PARSE_CACHE_SIZE MB.
+# The cache is disabled with the --no-cache command line option
+PARSE_CACHE_DIR = config.get("build", "cache_dir", fallback="parse_cache")
+PARSE_CACHE_SIZE = config.getint("build", "cache_size", fallback=1024)
+
+# a worker process of a parallel build is replaced once its peak resident
+# memory exceeds WORKER_MEMORY_BUDGET MB, 0 for no budget. Can be overridden
+# with the --memory-budget command line option
+WORKER_MEMORY_BUDGET = config.getint("build", "worker_memory_budget", fallback=0)
+
 ###################################################
 # Set logger, to log both to a file and to stdout #
 # code from https://stackoverflow.com/questions/13733552/logger-configuration-to-log-to-file-and-print-to-stdout
 ###################################################
+# the handlers are set by start_log_listener, so that importing the
+# generator, from the benchmarks for instance, does not empty the log file
 log_formatter = logging.Formatter("[%(levelname)-5.5s]  %(message)s")
 log = logging.getLogger()
-log.setLevel(logging.INFO)
 log_file_name = os.path.join(SWIG_OUTPUT_PATH, "generator.log")
-# ensure log file is emptied before running the generator
-lf = open(log_file_name, "w", encoding="utf8")
-lf.close()
 
-file_handler = logging.FileHandler(log_file_name)
-file_handler.setFormatter(log_formatter)
-log.addHandler(file_handler)
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setFormatter(log_formatter)
-log.addHandler(console_handler)
+# the module being processed, the log records are tagged with it
+LOG_MODULE = None
+# set by start_log_listener
+LOG_QUEUE = None
+# the directory of the module logs of a compact log, and the handler
+# that writes them, set by set_log_queue
+MODULE_LOG_DIR = None
+MODULE_LOG_HANDLER = None
+
+
+@contextlib.contextmanager
+def module_logging(module_name):
+    """Tag the records logged in the with block with module_name"""
+    global LOG_MODULE
+    LOG_MODULE = module_name
+    try:
+        yield
+    finally:
+        LOG_MODULE = None
+        if MODULE_LOG_HANDLER is not None:
+            MODULE_LOG_HANDLER.close_module(module_name)
+
+
+class ModuleLogFilter(logging.Filter):
+    """Tag the log records with the module being processed"""
+
+    def filter(self, record):
+        if not hasattr(record, "generator_module"):
+            record.generator_module = LOG_MODULE
+        return True
+
+
+class CompactLogFilter(logging.Filter):
+    """Only the module summaries, the warnings and the messages that are
+    not about a module are logged to generator.log and stdout
+    """
+
+    def filter(self, record):
+        return (
+            record.levelno >= logging.WARNING
+            or getattr(record, "generator_module", None) is None
+            or getattr(record, "module_summary", False)
+        )
+
+
+class ModuleLogHandler(logging.Handler):
+    """Append the log records of each module to log_dir/<module_name>.log.
+    In a parallel build, each process writes the records it logs
+    """
+
+    def __init__(self, log_dir):
+        super().__init__()
+        self.log_dir = log_dir
+        self._log_files = {}
+
+    def emit(self, record):
+        module_name = getattr(record, "generator_module", None)
+        if module_name is None:
+            return
+        log_file = self._log_files.get(module_name)
+        if log_file is None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            log_file = self._log_files[module_name] = open(
+                os.path.join(self.log_dir, f"{module_name}.log"), "a", encoding="utf8"
+            )
+        log_file.write(self.format(record) + "\n")
+        # the summary is the last record of a module
+        if getattr(record, "module_summary", False):
+            self.close_module(module_name)
+
+    def close_module(self, module_name):
+        """Close the log file of the module once processed, so that the files
+        of all modules are not open at once, and what the other processes
+        log for the module is appended after
+        """
+        log_file = self._log_files.pop(module_name, None)
+        if log_file is not None:
+            log_file.close()
+
+    def close(self):
+        for log_file in self._log_files.values():
+            log_file.close()
+        self._log_files = {}
+        super().close()
+
+
+def set_log_queue(log_queue, module_log_dir=None):
+    """Log to log_queue, see start_log_listener. If module_log_dir is not
+    None, the log is compact: the records of the modules are written to
+    module_log_dir by this process, and only the records of the compact log
+    are sent to the queue
+    """
+    global MODULE_LOG_DIR, MODULE_LOG_HANDLER
+    MODULE_LOG_DIR = module_log_dir
+    log.setLevel(logging.INFO)
+    for handler in log.handlers[:]:
+        log.removeHandler(handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(ModuleLogFilter())
+    log.addHandler(queue_handler)
+    if module_log_dir is not None:
+        queue_handler.addFilter(CompactLogFilter())
+        MODULE_LOG_HANDLER = ModuleLogHandler(module_log_dir)
+        MODULE_LOG_HANDLER.addFilter(ModuleLogFilter())
+        MODULE_LOG_HANDLER.setFormatter(log_formatter)
+        log.addHandler(MODULE_LOG_HANDLER)
+
+
+def start_log_listener(compact):
+    """Log through a queue, emptied by a thread of the main process that
+    writes to generator.log and stdout, so that the main process and the
+    worker processes do not wait for the writes. In compact mode, one
+    summary line is logged by module, and the log of each module is written
+    to the logs directory, next to generator.log
+    """
+    global LOG_QUEUE
+    # the queue is not bounded, so that logging never waits for the listener
+    LOG_QUEUE = log_queue = multiprocessing.Queue()
+    # the log file is emptied before running the generator
+    file_handler = logging.FileHandler(log_file_name, "w", encoding="utf8")
+    file_handler.setFormatter(log_formatter)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(log_formatter)
+    module_log_dir = None
+    if compact:
+        module_log_dir = os.path.join(os.path.dirname(log_file_name), "logs")
+        # the module logs are appended to, the ones of the last run are removed
+        if os.path.isdir(module_log_dir):
+            with os.scandir(module_log_dir) as dir_entries:
+                for dir_entry in dir_entries:
+                    if dir_entry.name.endswith(".log"):
+                        os.remove(dir_entry.path)
+    log_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler
+    )
+    set_log_queue(log_queue, module_log_dir)
+    log_listener.start()
+
+    def stop_log_listener():
+        log_listener.stop()
+        for handler in [file_handler, console_handler, MODULE_LOG_HANDLER]:
+            if handler is not None:
+                handler.close()
+
+    atexit.register(stop_log_listener)
+
 
 ####################
 # Global variables #
@@ -94,6 +275,7 @@ DOC_URL = "https://dev.opencascade.org/doc/occt-7.9.0/refman/html"
 ##################
 NB_TOTAL_CLASSES = 0  # number of wrapped classes
 NB_TOTAL_METHODS = 0  # number of wrapped methods
+CHANGED_FILES = []  # generated files that actually changed
 
 ALL_TOOLKITS = [
     TOOLKIT_Foundation,
@@ -107,6 +289,98 @@ TOOLKITS = {}
 for tk in ALL_TOOLKITS:
     TOOLKITS |= tk
 
+ModuleDefinition = namedtuple(
+    "ModuleDefinition",
+    [
+        "name",
+        "dependencies",
+        "exclude_classes",
+        "exclude_member_functions",
+        "toolkit",
+    ],
+)
+
+
+class ModuleRegistry:
+    """The OCCT_MODULES definitions, indexed by module name. The registry
+    is read only, the definitions are tuples. It is checked when loaded:
+    a ValueError lists the duplicated modules, the unknown
+    dependencies and the unknown modules of the toolkits.
+    """
+
+    def __init__(self, occt_modules, all_toolkits):
+        errors = []
+        module_toolkits = {}
+        toolkit_names = set()
+        for toolkits in all_toolkits:
+            for toolkit_name, toolkit_modules in toolkits.items():
+                if toolkit_name in toolkit_names:
+                    errors.append(f"toolkit {toolkit_name} defined twice")
+                toolkit_names.add(toolkit_name)
+                for module_name in toolkit_modules:
+                    if module_name in module_toolkits:
+                        errors.append(
+                            f"module {module_name} in toolkits "
+                            f"{module_toolkits[module_name]} and {toolkit_name}"
+                        )
+                    module_toolkits[module_name] = toolkit_name
+        modules = {}
+        for module in occt_modules:
+            if len(module) not in (3, 4):
+                errors.append(f"invalid module definition {module}")
+                continue
+            module_name = module[0]
+            if module_name in modules:
+                errors.append(f"module {module_name} defined twice")
+            exclude_member_functions = module[3] if len(module) == 4 else {}
+            modules[module_name] = ModuleDefinition(
+                module_name,
+                tuple(module[1]),
+                tuple(module[2]),
+                MappingProxyType(
+                    {
+                        class_name: tuple(member_functions)
+                        for class_name, member_functions in exclude_member_functions.items()
+                    }
+                ),
+                module_toolkits.get(module_name),
+            )
+        for module_definition in modules.values():
+            for dependency in module_definition.dependencies:
+                if dependency not in modules:
+                    errors.append(
+                        f"module {module_definition.name} depends on "
+                        f"unknown module {dependency}"
+                    )
+        for module_name, toolkit_name in module_toolkits.items():
+            if module_name not in modules:
+                errors.append(
+                    f"toolkit {toolkit_name} has unknown module {module_name}"
+                )
+        if errors:
+            raise ValueError("Invalid Modules.py:\n" + "\n".join(errors))
+        self._modules = MappingProxyType(modules)
+
+    def __contains__(self, module_name):
+        return module_name in self._modules
+
+    def __iter__(self):
+        """The module names, in the OCCT_MODULES order"""
+        return iter(self._modules)
+
+    def __len__(self):
+        return len(self._modules)
+
+    def get(self, module_name):
+        """The ModuleDefinition of module_name, NameError if not defined"""
+        try:
+            return self._modules[module_name]
+        except KeyError:
+            raise NameError(f"Module {module_name} not defined") from None
+
+
+MODULE_REGISTRY = ModuleRegistry(OCCT_MODULES, ALL_TOOLKITS)
+
 LICENSE_HEADER = """/*
 Copyright 2008-2025 Thomas Paviot (tpaviot@gmail.com)
 
@@ -130,12 +404,6 @@ along with pythonOCC.  If not, see <http://www.gnu.org/licenses/>.
 if not os.path.isdir(SWIG_OUTPUT_PATH):
     os.mkdir(SWIG_OUTPUT_PATH)
 
-# the following var is set when the module
-# is created
-CURRENT_MODULE = None
-PYTHON_MODULE_DEPENDENCY = []
-HEADER_DEPENDENCY = []
-
 # remove headers that can't be parse by CppHeaderParser
 HXX_TO_EXCLUDE_FROM_CPPPARSER = [
     "Standard_CLocaleSentry.hxx",
@@ -223,29 +491,299 @@ STANDARD_INTEGER_TYPEDEF = [
 # enums to skip
 ENUMS_TO_EXLUDE = ["ShapeMapGroup", "AllocatorType"]  # RWGtlf.i  # Standard.i
 
-# The list of all enums defined in oce
-ALL_ENUMS = []
 
-# The list of all enums passed and returned by reference
-# and need a SWIG specific template
-ALL_BYREF_ENUMS = []
+class Counters:
+    """The hits, misses, evictions and bytes of the registries and caches
+    the generator relies on, by name. In a parallel build, the counters
+    of the worker processes are sent back with the measures of each task.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        # objects that keep their own counts, for speed, collected
+        # with their pop_counts method when the counters are read
+        self._sources = []
+
+    def add_source(self, source):
+        self._sources.append(source)
+
+    def collect(self):
+        for source in self._sources:
+            self.add(source.pop_counts())
+
+    def count(self, name, event, value=1):
+        counter = self.counters.setdefault(name, {})
+        counter[event] = counter.get(event, 0) + value
+
+    def count_lookup(self, name, hit):
+        self.count(name, "hits" if hit else "misses")
+
+    def add(self, counters):
+        for name, counter in counters.items():
+            for event, value in counter.items():
+                self.count(name, event, value)
+
+    def pop(self):
+        """Returns the counters, and reset them"""
+        self.collect()
+        counters = self.counters
+        self.counters = {}
+        return counters
+
+    def get_counters(self):
+        """The counters sorted by name, with the hit rate of the lookups"""
+        self.collect()
+        counters = {}
+        for name, counter in sorted(self.counters.items()):
+            counters[name] = dict(counter)
+            nb_lookups = counter.get("hits", 0) + counter.get("misses", 0)
+            if nb_lookups:
+                counters[name]["hit_rate"] = counter.get("hits", 0) / nb_lookups
+        return counters
+
+    def log(self):
+        for name, counter in self.get_counters().items():
+            logging.info(
+                "Counters %s: %s",
+                name,
+                ", ".join(f"{event} {value:.4g}" for event, value in counter.items()),
+            )
+
+
+COUNTERS = Counters()
+
+
+# set by the SIGUSR1 handler. Logging from the handler could deadlock, if
+# the signal interrupts a logging call holding the log queue lock
+COUNTERS_LOG_REQUESTED = threading.Event()
+
+
+def request_counters_log(signum, frame):
+    """SIGUSR1 handler, the counters are logged by log_requested_counters"""
+    COUNTERS_LOG_REQUESTED.set()
+
+
+def log_requested_counters():
+    """Log the counters if SIGUSR1 was received, called between modules"""
+    if COUNTERS_LOG_REQUESTED.is_set():
+        COUNTERS_LOG_REQUESTED.clear()
+        COUNTERS.log()
+
+
+class Registries:
+    """What the modules processed so far define, and the next modules
+    depend on. The registries are only read while a module is processed,
+    what the module defines is added once it is processed.
+    """
+
+    def __init__(self):
+        # The set of all enums defined in oce. The sets are dicts,
+        # ordered as the names are registered
+        self.enums = {}
+        # The set of all enums passed and returned by reference
+        # and need a SWIG specific template
+        self.byref_enums = {}
+        # HArray1 apperead in occt 7x
+        # They are a kind of collection defined in NCollection_DefineHArray1
+        # a macro define this kind of object
+        self.harray1 = {}
+        # same for NCollection_DefineHarray2
+        self.harray2 = {}
+        # same for NCollection_DefineHSequence
+        self.hsequence = {}
+        # the set of all handles defined by the
+        # DEFINE_STANDARD_HANDLE occ macro. The set is a dict,
+        # ordered as the handles are registered
+        self.standard_handles = {}
+        # the set of al classes that inherit from Standard_Transient
+        # and, as a consequence, need the %wrap_handle and %make_alias macros
+        self.standard_transients = {"Standard_Transient": None}
+        # the header dependencies of the last processed module,
+        # Standard and NCollection keep them
+        self.header_dependency = []
+
+    def register(self, context):
+        """Add what the module processed with context defines"""
+        self.register_definitions(context.get_definitions())
+
+    def register_definitions(self, definitions):
+        """Add what a module defines, see GenerationContext.get_definitions"""
+        self.enums.update(dict.fromkeys(definitions["enums"]))
+        self.harray1.update(definitions["harray1"])
+        self.harray2.update(definitions["harray2"])
+        self.hsequence.update(definitions["hsequence"])
+        self.standard_handles.update(dict.fromkeys(definitions["standard_handles"]))
+        self.standard_transients.update(
+            dict.fromkeys(definitions["standard_transients"])
+        )
+        # kept if the module did not set them, see get_header_dependency
+        if definitions["header_dependency"] is not None:
+            self.header_dependency = definitions["header_dependency"]
+
+    def register_byref_enums(self, byref_enums):
+        """Byref enums are registered apart, they are only known once the
+        module SWIG files are generated
+        """
+        self.byref_enums.update(dict.fromkeys(byref_enums))
+
+
+class GenerationContext:
+    """The state of the module being processed: its name, its
+    dependencies, and what it defines. The cross-module registries
+    are only read.
+    """
+
+    def __init__(self, module_name, registries):
+        self.module_name = module_name
+        self.registries = registries
+        # what was read from the registries, a dict
+        # {(registry_name, name): answer}, see ModuleManifest
+        self.consumed_facts = {}
+        # all modules depend, by default, upon Standard, NCollection and others
+        if module_name not in ["Standard", "NCollection"]:
+            self.python_module_dependency = ["Standard", "NCollection"]
+            self.header_dependency = ["TColgp", "TColStd", "TCollection", "Storage"]
+        else:
+            self.python_module_dependency = []
+            # read from the registries when needed, see get_header_dependency
+            self.header_dependency = None
+        # Since the move up to swig-4.1.1, statuc functions are not
+        # renamed anymore to free function
+        # for example, with 4.0.2
+        # it is possible to use either
+        # XCAFDoc_DocumentTool_ColorTool
+        # or
+        # XCAFDoc_DocumentTool.ColorTool
+        # in swig-4.1.1, only the later is possible
+        # for backward compatibility,
+        # XCAFDoc_DocumentTool_ColorTool is marked as deprecated
+        # and cool the XCAFDoc_DocumentTool.ColorTool method
+        self.deprecated_static_functions = []
+        # what the module defines, see Registries. enums, byref_enums,
+        # standard_handles and standard_transients are ordered sets
+        self.enums = {}
+        self.byref_enums = {}
+        self.harray1 = {}
+        self.harray2 = {}
+        self.hsequence = {}
+        self.standard_handles = {}
+        self.standard_transients = {}
+        # for statistics, the timings and memory are in ModuleMeasures
+        self.nb_classes = 0
+        self.nb_methods = 0
+        self.nb_overloads = 0
+        # the module classes, in inheritance order, see get_inheritance_tree
+        self.inheritance_tree = None
+
+    def get_definitions(self):
+        """What the module defines, and the statistics"""
+        return {
+            "enums": list(self.enums),
+            "byref_enums": list(self.byref_enums),
+            "harray1": self.harray1,
+            "harray2": self.harray2,
+            "hsequence": self.hsequence,
+            "standard_handles": list(self.standard_handles),
+            "standard_transients": list(self.standard_transients),
+            "header_dependency": self.header_dependency,
+            "nb_classes": self.nb_classes,
+            "nb_methods": self.nb_methods,
+            "nb_overloads": self.nb_overloads,
+        }
+
+    def set_definitions(self, definitions):
+        for name, value in definitions.items():
+            if name in (
+                "enums",
+                "byref_enums",
+                "standard_handles",
+                "standard_transients",
+            ):
+                value = dict.fromkeys(value)
+            setattr(self, name, value)
+
+    def get_header_definitions(self):
+        """The handles and harray/hsequence definitions found by adapt_header_file"""
+        return self.standard_handles, self.harray1, self.harray2, self.hsequence
+
+    def add_header_definitions(self, header_definitions):
+        handles, harray1, harray2, hsequence = header_definitions
+        self.standard_handles.update(dict.fromkeys(handles))
+        self.harray1.update(harray1)
+        self.harray2.update(harray2)
+        self.hsequence.update(hsequence)
+
+    def get_header_dependency(self):
+        """The modules whose headers the module includes. Standard and
+        NCollection keep the ones of the last processed module
+        """
+        if self.header_dependency is None:
+            self.header_dependency = self.lookup("header_dependency")
+        return self.header_dependency
+
+    def lookup(self, registry_name, name=None):
+        """Read the registries, and record what was read. The class index,
+        if set, completes the registries with the modules not processed yet
+        """
+        registry = getattr(self.registries, registry_name)
+        if registry_name in ["harray1", "harray2", "hsequence"]:
+            # only the classes of the module are wrapped
+            module_hclasses = {
+                class_name: base_name
+                for class_name, base_name in registry.items()
+                if class_name.startswith(self.module_name + "_")
+            }
+            if CLASS_INDEX is not None:
+                for class_name, base_name in CLASS_INDEX.get_module_hclasses(
+                    registry_name, self.module_name
+                ).items():
+                    module_hclasses.setdefault(class_name, base_name)
+            answer = [list(item) for item in module_hclasses.items()]
+        elif registry_name == "header_dependency":
+            answer = registry.copy()
+        else:
+            answer = name in registry
+            if not answer and CLASS_INDEX is not None:
+                answer = CLASS_INDEX.lookup(registry_name, name)
+        COUNTERS.count_lookup(f"registries.{registry_name}", answer)
+        self.consumed_facts[(registry_name, name)] = answer
+        return answer
+
+    def is_enum(self, name):
+        return name in self.enums or self.lookup("enums", name)
+
+    def is_standard_handle(self, class_name):
+        return class_name in self.standard_handles or self.lookup(
+            "standard_handles", class_name
+        )
+
+    def is_standard_transient(self, class_name):
+        return class_name in self.standard_transients or self.lookup(
+            "standard_transients", class_name
+        )
+
+    def _get_module_hclasses(self, registry_name):
+        module_hclasses = dict(self.lookup(registry_name))
+        for class_name, base_name in getattr(self, registry_name).items():
+            if class_name.startswith(self.module_name + "_"):
+                module_hclasses[class_name] = base_name
+        return module_hclasses
+
+    def get_harray1(self):
+        """The harray1 classes of the module"""
+        return self._get_module_hclasses("harray1")
+
+    def get_harray2(self):
+        """The harray2 classes of the module"""
+        return self._get_module_hclasses("harray2")
 
-# HArray1 apperead in occt 7x
-# They are a kind of collection defined in NCollection_DefineHArray1
-# a macro define this kind of object
-ALL_HARRAY1 = {}
-# same for NCollection_DefineHarray2
-ALL_HARRAY2 = {}
-# same for NCollection_DefineHSequence
-ALL_HSEQUENCE = {}
+    def get_hsequence(self):
+        """The hsequence classes of the module"""
+        return self._get_module_hclasses("hsequence")
 
-# the list of all handles defined by the
-# DEFINE_STANDARD_HANDLE occ macro
-ALL_STANDARD_HANDLES = []
 
-# the list of al classes that inherit from Standard_Transient
-# and, as a consequence, need the %wrap_handle and %make_alias macros
-ALL_STANDARD_TRANSIENTS = ["Standard_Transient"]
+# the registries filled by the modules processed so far
+REGISTRIES = Registries()
 
 # classes that must not wrap a default constructor
 NODEFAULTCTOR = [
@@ -1047,28 +1585,18 @@ BREPTOOLS_WRITE_READ_FROM_STRING_PYI = """
 ###########################
 BYREF_ENUM_TEMPLATE = "ENUM_OUTPUT_TYPEMAPS(%s);\n"
 
-########################
-# Since the move up to swig-4.1.1, statuc functions are not
-# renamed anymore to free function
-# for example, with 4.0.2
-# it is possible to use either
-# XCAFDoc_DocumentTool_ColorTool
-# or
-# XCAFDoc_DocumentTool.ColorTool
-# in swig-4.1.1, only the later is possible
-# for backward compatibility,
-# XCAFDoc_DocumentTool_ColorTool is marked as deprecated
-# and cool the XCAFDoc_DocumentTool.ColorTool method
-DEPRECATED_STATIC_FUNCTIONS = []
-
 
 def get_log_header():
     """returns a header to be appended to the SWIG file
     Useful for development
     """
     os_name = f"{platform.system()} {platform.architecture()[0]} {platform.release()}"
+    # the revision of the generator, whatever the current directory
     generator_git_revision = (
-        subprocess.check_output(["git", "rev-parse", "--short", "HEAD"])
+        subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
         .strip()
         .decode("utf8")
     )
@@ -1103,11 +1631,6 @@ SWIG interface file generation completed in {:.2f}s
     )
 
 
-def reset_header_depency():
-    global HEADER_DEPENDENCY
-    HEADER_DEPENDENCY = ["TColgp", "TColStd", "TCollection", "Storage"]
-
-
 def check_is_persistent(class_name):
     """
     Checks, whether a class belongs to the persistent classes (and not to the transient ones)
@@ -1154,23 +1677,85 @@ def test_filter_header_list():
         ) == ["something"]
 
 
-def case_sensitive_glob(wildcard):
+class IncludeDirIndex:
+    """The headers of the include directory, scanned once and indexed by
+    module: gp.hxx and gp_Pnt.hxx are headers of the gp module.
+    The index is case sensitive on every platform, it makes the difference
+    between GEOM_* and Geom_* under Windows.
     """
-    Case sensitive glob for Windows.
-    Designed for handling of GEOM and Geom modules
-    This function makes the difference between GEOM_* and Geom_* under Windows
-    """
-    flist = glob.glob(wildcard)
-    pattern = wildcard.split("*")[0]
-    return [file_ for file_ in flist if pattern in file_]
+
+    def __init__(self, include_dir):
+        header_list = []
+        with os.scandir(include_dir) as dir_entries:
+            for dir_entry in dir_entries:
+                if dir_entry.name.endswith(".hxx") and dir_entry.is_file():
+                    header_list.append(dir_entry.path)
+        header_list.sort()
+        # the classes with a Handle_<class>.hxx header, or a
+        # <class>_Handle.hxx header for Graphic3d classes
+        self._handle_header_classes = set()
+        for header_filename in header_list:
+            header_name = os.path.basename(header_filename)
+            if header_name.startswith("Handle_"):
+                self._handle_header_classes.add(header_name[7:-4])
+            elif header_name.startswith("Graphic3d") and header_name.endswith(
+                "_Handle.hxx"
+            ):
+                self._handle_header_classes.add(header_name[:-11])
+        self._module_headers = self._index(header_list)
+        self._headers_to_parse = self._index(
+            filter_header_list(header_list.copy(), HXX_TO_EXCLUDE_FROM_CPPPARSER)
+        )
+        self._headers_to_include = self._index(
+            filter_header_list(header_list.copy(), HXX_TO_EXCLUDE_FROM_BEING_INCLUDED)
+        )
+
+    @staticmethod
+    def _index(header_list):
+        index = {}
+        for header_filename in header_list:
+            module_name = os.path.basename(header_filename)[:-4].split("_")[0]
+            index.setdefault(module_name, []).append(header_filename)
+        return index
+
+    def has_handle_header(self, class_name):
+        """True if a Handle_X.hxx (or Graphic3d X_Handle.hxx) header exists"""
+        has_handle_header = class_name in self._handle_header_classes
+        COUNTERS.count_lookup("include_dir_index.handle_headers", has_handle_header)
+        return has_handle_header
+
+    def get_module_headers(self, module_name):
+        """All the module headers, sorted"""
+        return self._module_headers.get(module_name, [])
+
+    def get_headers_to_parse(self, module_name):
+        """The module headers CppHeaderParser can parse, sorted"""
+        return self._headers_to_parse.get(module_name, [])
+
+    def get_headers_to_include(self, module_name):
+        """The module headers that can be included, sorted"""
+        return self._headers_to_include.get(module_name, [])
+
+
+INCLUDE_DIR_INDEX = None
+
+
+def get_include_dir_index():
+    """The index of OCCT_INCLUDE_DIR, scanned on first use"""
+    global INCLUDE_DIR_INDEX
+    if INCLUDE_DIR_INDEX is None:
+        INCLUDE_DIR_INDEX = IncludeDirIndex(OCCT_INCLUDE_DIR)
+    return INCLUDE_DIR_INDEX
 
 
 def get_all_module_headers(module_name):
     """Returns a list with all header names"""
-    mh = case_sensitive_glob(os.path.join(OCCT_INCLUDE_DIR, f"{module_name}.hxx"))
-    mh += case_sensitive_glob(os.path.join(OCCT_INCLUDE_DIR, f"{module_name}_*.hxx"))
-    mh = filter_header_list(mh, HXX_TO_EXCLUDE_FROM_BEING_INCLUDED)
-    return sorted(map(os.path.basename, mh))
+    return [
+        os.path.basename(header_filename)
+        for header_filename in get_include_dir_index().get_headers_to_include(
+            module_name
+        )
+    ]
 
 
 def test_get_all_module_headers():
@@ -1183,40 +1768,78 @@ def test_get_all_module_headers():
     assert not headers_list_2
 
 
-def check_has_related_handle(class_name):
+def check_has_related_handle(context, class_name):
     """For a given class :
     Check if a header exists.
     """
     if check_is_persistent(class_name):
         return False
 
-    filename = os.path.join(OCCT_INCLUDE_DIR, f"Handle_{class_name}.hxx")
-    other_possible_filename = filename
-    if class_name.startswith("Graphic3d"):
-        other_possible_filename = os.path.join(
-            OCCT_INCLUDE_DIR, f"{class_name}_Handle.hxx"
-        )
-    return (
-        os.path.exists(filename)
-        or os.path.exists(other_possible_filename)
-        or need_handle(class_name)
+    return get_include_dir_index().has_handle_header(class_name) or need_handle(
+        context, class_name
     )
 
 
-def need_handle(class_name):
+def need_handle(context, class_name):
     """Returns True if the current parsed class needs an
     Handle to be defined. This is useful when headers define
     handles but no header"""
     # @TODO what about DEFINE_RTTI ?
-    return class_name in ALL_STANDARD_HANDLES or class_name in ALL_STANDARD_TRANSIENTS
+    return context.is_standard_handle(class_name) or context.is_standard_transient(
+        class_name
+    )
+
+
+# The macros adapt_header_file deals with, and what is done with them:
+# * handle : Handle(Something) moved to opencascade::handle<Something>,
+# otherwise CppHeaderParser is confused ;
+# * standard_handle : registered in the context and commented out ;
+# * harray1, harray2, hsequence : registered in the context dict of that name ;
+# * deprecated : commented out, the deprecation message is removed ;
+# * comment, remove : macros that prevent CppHeaderParser to parse the header
+HEADER_MACROS = {
+    "Handle": "handle",
+    "DEFINE_STANDARD_HANDLE": "standard_handle",
+    "DEFINE_HARRAY1": "harray1",
+    "DEFINE_HARRAY2": "harray2",
+    "DEFINE_HSEQUENCE": "hsequence",
+    "Standard_DEPRECATED": "deprecated",
+    "DEFINE_STANDARD_RTTIEXT": "comment",
+    "DEFINE_STANDARD_RTTI_INLINE": "comment",
+    "NCOLLECTION_HSEQUENCE": "comment",
+    "DECLARE_TOBJOCAF_PERSISTENCE": "comment",
+    "DEFINE_DERIVED_ATTRIBUTE": "comment",
+    "DEFINE_STANDARD_ALLOC": "remove",
+    "Standard_EXPORT": "remove",
+    "Standard_NODISCARD": "remove",
+}
+# The arguments that are part of the macro, by action
+_MACRO_ARGUMENTS = r"\s*\([\w\s]+,+[\w\s]+\)"
+HEADER_MACRO_ARGUMENTS = {
+    "handle": r"\(\w+\)",
+    "standard_handle": f"(?:{_MACRO_ARGUMENTS})?",
+    "harray1": _MACRO_ARGUMENTS,
+    "harray2": _MACRO_ARGUMENTS,
+    "hsequence": _MACRO_ARGUMENTS,
+    "deprecated": r'(?:\s*\(\s*".*?(?:\\"|[^"])*?"(?:\s*".*?(?:\\"|[^"])*?")*\s*\))?',
+    "comment": "",
+    "remove": "",
+}
+# No capturing group, so that the pattern is searched for as fast as
+# the macro names are
+HEADER_MACRO_PATTERN = re.compile(
+    "|".join(
+        macro_name + HEADER_MACRO_ARGUMENTS[action]
+        for macro_name, action in HEADER_MACROS.items()
+    )
+)
 
 
-def adapt_header_file(header_content):
-    """take an header filename as input.
-    Returns the output of a tempfile with :
-    * all occurrences of Handle(something) moved to Handle_Something
-    otherwise CppHeaderParser is confused ;
-    * all define RTTI moved
+def adapt_header_file(context, header_content):
+    """take an header content as input.
+    Returns the header content with the macros of HEADER_MACROS adapted,
+    in a single pass. The handles and harray/hsequence classes are registered
+    in the context.
     """
     # no need to deal with Deprecated headers
     if ("Deprecated alias to moved class" in header_content) or (
@@ -1224,107 +1847,592 @@ def adapt_header_file(header_content):
     ):
         return ""  # return empty header
 
-    # search for STANDARD_HANDLE
-    outer = re.compile("DEFINE_STANDARD_HANDLE[\\s]*\\([\\w\\s]+\\,+[\\w\\s]+\\)")
-    if matches := outer.findall(header_content):
-        for match in matches:
-            ALL_STANDARD_HANDLES.append(match.split("(")[1].split(",")[0])
-    # Search for RTTIEXT
-    outer = re.compile("DEFINE_STANDARD_RTTIEXT[\\s]*\\([\\w\\s]+\\,+[\\w\\s]+\\)")
-    matches = outer.findall(header_content)
-    # Search for HARRAY1
-    outer = re.compile("DEFINE_HARRAY1[\\s]*\\([\\w\\s]+\\,+[\\w\\s]+\\)")
-    if matches := outer.findall(header_content):
-        for match in matches:
-            # @TODO find inheritance name
-            typename = match.split("(")[1].split(",")[0]
-            base_typename = match.split(",")[1].split(")")[0]
-            logging.info("Found HARRAY1 definition %s:%s", typename, base_typename)
-            ALL_HARRAY1[typename] = base_typename.strip()
-    # Search for HARRAY2
-    outer = re.compile("DEFINE_HARRAY2[\\s]*\\([\\w\\s]+\\,+[\\w\\s]+\\)")
-    if matches := outer.findall(header_content):
-        for match in matches:
-            # @TODO find inheritance name
-            typename = match.split("(")[1].split(",")[0]
-            base_typename = match.split(",")[1].split(")")[0]
-            logging.info("Found HARRAY2 definition %s:%s", typename, base_typename)
-            ALL_HARRAY2[typename] = base_typename.strip()
-    # Search for HSEQUENCE
-    outer = re.compile("DEFINE_HSEQUENCE[\\s]*\\([\\w\\s]+\\,+[\\w\\s]+\\)")
-    if matches := outer.findall(header_content):
-        for match in matches:
+    def adapt_macro(match):
+        macro = match.group()
+        if (action := HEADER_MACROS.get(macro)) is None:
+            action = HEADER_MACROS[macro.split("(")[0].rstrip()]
+        if action == "remove":
+            return ""
+        if action == "handle":
+            class_name = macro[7:-1]
+            if not class_name[0].isupper():
+                return macro
+            return f"opencascade::handle<{class_name}>"
+        if action == "standard_handle":
+            if macro != "DEFINE_STANDARD_HANDLE":
+                context.standard_handles[macro.split("(")[1].split(",")[0]] = None
+        elif action == "deprecated":
+            # TODO : use the @deprecated python decorator to raise a Deprecation
+            # exception, see https://github.com/tantale/deprecated
+            if macro != "Standard_DEPRECATED":
+                message = macro[macro.index("(") + 1 : macro.rindex(")")].strip()
+                macro = macro.replace(message, "//DEPRECATION_WARNING", 1)
+        elif action != "comment":
+            # harray1, harray2 or hsequence
             # @TODO find inheritance name
-            typename = match.split("(")[1].split(",")[0]
-            base_typename = match.split(",")[1].split(")")[0]
-            logging.info("Found HSEQUENCE definition %s:%s", typename, base_typename)
-            ALL_HSEQUENCE[typename] = base_typename.strip()
-    # skip some defines that prevent header parsing
-    header_content = header_content.replace(
-        "DEFINE_STANDARD_HANDLE", "//DEFINE_STANDARD_HANDLE"
-    )
-    header_content = header_content.replace(
-        "DEFINE_STANDARD_RTTIEXT", "//DEFINE_STANDARD_RTTIEXT"
-    )
-    header_content = header_content.replace(
-        "DEFINE_STANDARD_RTTI_INLINE", "//DEFINE_STANDARD_RTTI_INLINE"
+            typename = macro.split("(")[1].split(",")[0]
+            base_typename = macro.split(",")[1].split(")")[0].strip()
+            logging.info(
+                "Found %s definition %s:%s", action.upper(), typename, base_typename
+            )
+            getattr(context, action)[typename] = base_typename
+            return macro
+        return f"//{macro}"
+
+    return HEADER_MACRO_PATTERN.sub(adapt_macro, header_content)
+
+
+def test_adapt_header_file():
+    context = GenerationContext("TColStd", Registries())
+    header_content = (
+        "DEFINE_STANDARD_HANDLE(TColStd_HPackedMapOfInteger, Standard_Transient)\n"
+        "DEFINE_HARRAY1(TColStd_HArray1OfReal, TColStd_Array1OfReal)\n"
+        "class TColStd_HPackedMapOfInteger : public Standard_Transient {\n"
+        "public:\n"
+        "  DEFINE_STANDARD_ALLOC\n"
+        '  Standard_DEPRECATED("Deprecated, use Handle(Foo) instead")\n'
+        "  Standard_EXPORT Handle(TColStd_HArray1OfReal) Values(const Handle(x));\n"
+        "  DEFINE_STANDARD_RTTIEXT(TColStd_HPackedMapOfInteger, Standard_Transient)\n"
+        "};\n"
     )
-    header_content = header_content.replace(
-        "NCOLLECTION_HSEQUENCE", "//NCOLLECTION_HSEQUENCE"
+    assert adapt_header_file(context, header_content) == (
+        "//DEFINE_STANDARD_HANDLE(TColStd_HPackedMapOfInteger, Standard_Transient)\n"
+        "DEFINE_HARRAY1(TColStd_HArray1OfReal, TColStd_Array1OfReal)\n"
+        "class TColStd_HPackedMapOfInteger : public Standard_Transient {\n"
+        "public:\n"
+        "  \n"
+        "  //Standard_DEPRECATED(//DEPRECATION_WARNING)\n"
+        "   opencascade::handle<TColStd_HArray1OfReal> Values(const Handle(x));\n"
+        "  //DEFINE_STANDARD_RTTIEXT(TColStd_HPackedMapOfInteger, Standard_Transient)\n"
+        "};\n"
     )
-    # Search for Standard_DEPRECATED
-    pattern = re.compile(
-        r'Standard_DEPRECATED\s*\(\s*(".*?(?:\\"|[^"])*?"(?:\s*".*?(?:\\"|[^"])*?")*)\s*\)'
+    assert list(context.standard_handles) == ["TColStd_HPackedMapOfInteger"]
+    assert context.harray1 == {"TColStd_HArray1OfReal": "TColStd_Array1OfReal"}
+    assert adapt_header_file(context, "// Deprecated alias to moved class") == ""
+
+
+# CppHeaderParser tokens are str subclasses that carry their location in the
+# header, and can't be unpickled as is. The location is not used by the generator,
+# tokens are sent to/from the worker processes of a parallel build as plain strings
+copyreg.pickle(CppHeaderParser.TagStr, lambda tag_str: (str, (str(tag_str),)))
+
+
+def get_parser_key():
+    """The hash of what a parsed header depends on, besides the header content:
+    the CppHeaderParser version and the adapt_header_file code and macro tables
+    """
+    return hashlib.sha256(
+        bytes(
+            CppHeaderParser.__version__
+            + HEADER_MACRO_PATTERN.pattern
+            + repr(HEADER_MACROS)
+            + repr(HEADER_MACRO_ARGUMENTS)
+            + inspect.getsource(adapt_header_file),
+            encoding="utf8",
+        )
+    ).hexdigest()
+
+
+class ParseCache:
+    """On-disk cache of the parsed headers. An entry is keyed by the header
+    content and the parser key, see get_parser_key, so that it is never out
+    of date. The least recently used entries are removed when the cache
+    exceeds max_size MB.
+    """
+
+    def __init__(self, cache_dir, max_size):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._parser_key = get_parser_key()
+
+    def get_key(self, header_content):
+        key = hashlib.sha256(bytes(self._parser_key, encoding="utf8"))
+        key.update(bytes(header_content, encoding="utf8"))
+        return key.hexdigest()
+
+    def _get_entry_filename(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pickle")
+
+    def get(self, key):
+        """Returns the cached entry, None if not cached"""
+        entry_filename = self._get_entry_filename(key)
+        try:
+            with open(entry_filename, "rb") as entry_file:
+                entry_data = entry_file.read()
+        except FileNotFoundError:
+            COUNTERS.count("parse_cache", "misses")
+            return None
+        COUNTERS.count("parse_cache", "hits")
+        COUNTERS.count("parse_cache", "bytes_read", len(entry_data))
+        entry = pickle.loads(zlib.decompress(entry_data))
+        # the modification time is the last use time
+        os.utime(entry_filename)
+        return entry
+
+    def put(self, key, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_filename = self._get_entry_filename(key)
+        # worker processes may write the same entry
+        tmp_filename = f"{entry_filename}.{os.getpid()}.tmp"
+        entry_data = zlib.compress(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL), 1)
+        with open(tmp_filename, "wb") as entry_file:
+            entry_file.write(entry_data)
+        os.replace(tmp_filename, entry_filename)
+        COUNTERS.count("parse_cache", "bytes_written", len(entry_data))
+
+    def evict(self):
+        """Remove the least recently used entries, until the
+        cache size is below max_size
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        entries = []
+        with os.scandir(self.cache_dir) as dir_entries:
+            for dir_entry in dir_entries:
+                if dir_entry.name.endswith(".pickle"):
+                    stat = dir_entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+        cache_size = sum(size for _, size, _ in entries)
+        nb_evicted = 0
+        for _, size, entry_filename in sorted(entries):
+            if cache_size <= self.max_size * 1024 * 1024:
+                break
+            os.remove(entry_filename)
+            cache_size -= size
+            nb_evicted += 1
+            COUNTERS.count("parse_cache", "evictions")
+            COUNTERS.count("parse_cache", "bytes_evicted", size)
+        logging.info(
+            "Parse cache: %s entries, %.1f MB, %s evicted",
+            len(entries) - nb_evicted,
+            cache_size / (1024 * 1024),
+            nb_evicted,
+        )
+
+    def clear(self):
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+
+
+# set by the --no-cache command line option
+PARSE_CACHE = None
+
+
+def set_parse_cache(parse_cache):
+    """Set the parse cache, ParseCache or None"""
+    global PARSE_CACHE
+    PARSE_CACHE = parse_cache
+
+
+def parse_header(context, header_filename, measures):
+    """Use CppHeaderParser module to parse header_filename.
+    Returns the header typedefs, enums, classes and free functions.
+    The stages are timed in measures, ModuleMeasures
+    """
+    with measures.timer("file_read"):
+        with open(header_filename, "r", encoding="utf-8") as header_file:
+            header_content = header_file.read()
+    if PARSE_CACHE is not None:
+        with measures.timer("parse_cache"):
+            cache_key = PARSE_CACHE.get_key(header_content)
+            cache_entry = PARSE_CACHE.get(cache_key)
+        if cache_entry is not None:
+            parsed_header, header_definitions = cache_entry
+            context.add_header_definitions(header_definitions)
+            return parsed_header
+    # what adapt_header_file finds is cached with the parsed header
+    header_context = GenerationContext(context.module_name, Registries())
+    with measures.timer("adapt_header_file"):
+        adapted_header_content = adapt_header_file(header_context, header_content)
+    try:
+        with measures.timer("cpp_header_parser"):
+            cpp_header = CppHeaderParser.CppHeader(adapted_header_content, "string")
+    except CppHeaderParser.CppParseError as e:
+        error_message = f"Error: cannot parse {header_filename}\n"
+        error_message += f"Reason: {e}"
+        raise RuntimeError(error_message)
+    parsed_header = (
+        cpp_header.typedefs,
+        cpp_header.enums,
+        cpp_header.classes,
+        cpp_header.functions,
     )
-    if matches := pattern.findall(header_content):
-        for match in matches:
-            header_content = header_content.replace(match, "//DEPRECATION_WARNING")
+    header_definitions = header_context.get_header_definitions()
+    if PARSE_CACHE is not None:
+        with measures.timer("parse_cache"):
+            PARSE_CACHE.put(cache_key, (parsed_header, header_definitions))
+    context.add_header_definitions(header_definitions)
+    return parsed_header
+
+
+class ClassIndex:
+    """The classes of the modules of the include dir: for each class, its
+    header, base classes and abstractness, and the handles and the
+    harray/hsequence classes of each module. Whether a class has a handle
+    and inherits from Standard_Transient is answered from it. Unlike the
+    registries, the index does not depend on the modules processed so far:
+    a module can be processed alone, or before the modules it depends on.
+    The index is made of an entry by module, built the first time the
+    module is needed, and only built again when the module headers change,
+    see get_fingerprint. As for the headers, the module of a class is the
+    prefix of its name, see get_class_module.
+    """
+
+    def __init__(self, module_entries=None, index_key=None):
+        # module name -> {"fingerprint", "classes", "standard_handles",
+        # "harray1", "harray2", "hsequence"}, where "classes" is
+        # class name -> {"header", "bases", "abstract"}
+        self.module_entries = module_entries if module_entries is not None else {}
+        # None if the entries are complete, and never indexed
+        self.index_key = index_key
+        self.checked_modules = set()
+        # the entries indexed by this process, see pop_new_entries
+        self.new_entries = {}
+        self.transient = {"Standard_Transient": True}
+
+    def add_header(self, module_name, header_filename, classes, header_definitions):
+        """Index the classes and definitions of a parsed header of the module.
+        The first definition of a class is kept
+        """
+        module_entry = self.module_entries.setdefault(
+            module_name,
+            {
+                "fingerprint": None,
+                "classes": {},
+                "standard_handles": [],
+                "harray1": {},
+                "harray2": {},
+                "hsequence": {},
+            },
+        )
+        handles, harray1, harray2, hsequence = header_definitions
+        for klass in classes.values():
+            module_entry["classes"].setdefault(
+                klass["name"],
+                {
+                    "header": os.path.basename(header_filename),
+                    "bases": [
+                        upper_class["class"] for upper_class in klass["inherits"]
+                    ],
+                    "abstract": bool(klass["abstract"]),
+                },
+            )
+        module_entry["standard_handles"].extend(handles)
+        for registry_name, header_hclasses in [
+            ("harray1", harray1),
+            ("harray2", harray2),
+            ("hsequence", hsequence),
+        ]:
+            for class_name, base_name in header_hclasses.items():
+                module_entry[registry_name].setdefault(class_name, base_name)
+
+    def get_module_entry(self, module_name):
+        """The entry of the module, indexed if missing or outdated.
+        None if the module is not defined
+        """
+        if self.index_key is None or module_name in self.checked_modules:
+            return self.module_entries.get(module_name)
+        if not is_module(module_name):
+            return None
+        fingerprint = ClassIndex.get_fingerprint(module_name, self.index_key)
+        module_entry = self.module_entries.get(module_name)
+        up_to_date = module_entry is not None and (
+            module_entry["fingerprint"] == fingerprint
+        )
+        COUNTERS.count_lookup("class_index", up_to_date)
+        if not up_to_date:
+            module_entry = ClassIndex.index_module(module_name, fingerprint)
+            self.module_entries[module_name] = module_entry
+            self.new_entries[module_name] = module_entry
+        self.checked_modules.add(module_name)
+        return module_entry
+
+    def get_class(self, class_name):
+        """The index entry of the class, None if not indexed"""
+        module_entry = self.get_module_entry(get_class_module(class_name))
+        if module_entry is None:
+            return None
+        return module_entry["classes"].get(class_name)
+
+    def is_transient(self, class_name):
+        """As in build_inheritance_tree, a class is transient if its first
+        base class is Standard_Transient or is transient
+        """
+        chain = []
+        tmp = class_name
+        while tmp not in self.transient:
+            chain.append(tmp)
+            class_entry = self.get_class(tmp)
+            bases = class_entry["bases"] if class_entry is not None else []
+            if not bases or bases[0] in chain:
+                self.transient[tmp] = False
+                break
+            tmp = bases[0]
+        for ancestor_name in chain:
+            self.transient[ancestor_name] = self.transient[tmp]
+        return self.transient[class_name]
+
+    def lookup(self, registry_name, name):
+        """What the index tells of name, for the registries it covers"""
+        if registry_name == "standard_handles":
+            module_entry = self.get_module_entry(get_class_module(name))
+            answer = module_entry is not None and (
+                name in module_entry["standard_handles"]
+            )
+        elif registry_name == "standard_transients":
+            answer = self.is_transient(name)
+        else:
+            return False
+        COUNTERS.count_lookup(f"class_index.{registry_name}", answer)
+        return answer
+
+    def get_module_hclasses(self, registry_name, module_name):
+        """The harray1, harray2 or hsequence classes of the module"""
+        module_entry = self.get_module_entry(module_name)
+        if module_entry is None:
+            return {}
+        return {
+            class_name: base_name
+            for class_name, base_name in module_entry[registry_name].items()
+            if class_name.startswith(module_name + "_")
+        }
+
+    def pop_new_entries(self):
+        """The entries indexed by this process since the last call, for a
+        worker process to send them to the main process, see add_entries
+        """
+        new_entries = self.new_entries
+        self.new_entries = {}
+        return new_entries
+
+    def add_entries(self, module_entries):
+        """Add the entries indexed by a worker process, they are saved
+        with the entries indexed by this process
+        """
+        self.module_entries.update(module_entries)
+        self.new_entries.update(module_entries)
+
+    @staticmethod
+    def get_index_key():
+        """The hash of the parser and of the index code, that all the
+        module entries depend on
+        """
+        return hashlib.sha256(
+            bytes(get_parser_key() + inspect.getsource(ClassIndex), encoding="utf8")
+        ).hexdigest()
+
+    @staticmethod
+    def get_fingerprint(module_name, index_key):
+        """The hash of the index key, and of the names, sizes and modification
+        times of the module headers
+        """
+        fingerprint = hashlib.sha256(bytes(index_key, encoding="utf8"))
+        for header_filename in get_include_dir_index().get_headers_to_parse(
+            module_name
+        ):
+            stat = os.stat(header_filename)
+            fingerprint.update(
+                bytes(
+                    f"{os.path.basename(header_filename)} {stat.st_size} "
+                    f"{stat.st_mtime_ns}\n",
+                    encoding="utf8",
+                )
+            )
+        return fingerprint.hexdigest()
+
+    @classmethod
+    def index_module(cls, module_name, fingerprint):
+        """The index entry of a module. The headers are parsed with the
+        parse cache if set, the ones that cannot be parsed are skipped
+        """
+        class_index = cls()
+        # the entry of a module without any parsed header is empty
+        class_index.add_header(module_name, "", {}, ([], {}, {}, {}))
+        for header_filename in get_include_dir_index().get_headers_to_parse(
+            module_name
+        ):
+            context = GenerationContext(module_name, Registries())
+            try:
+                _, _, classes, _ = parse_header(
+                    context, header_filename, ModuleMeasures(module_name)
+                )
+            except RuntimeError as e:
+                logging.warning("Class index: %s", e)
+                continue
+            class_index.add_header(
+                module_name,
+                header_filename,
+                classes,
+                context.get_header_definitions(),
+            )
+        module_entry = class_index.module_entries[module_name]
+        module_entry["fingerprint"] = fingerprint
+        return module_entry
 
-    header_content = header_content.replace(
-        "Standard_DEPRECATED", "//Standard_DEPRECATED"
+    @staticmethod
+    def load(class_index_filename):
+        """The stored module entries, empty if missing or invalid"""
+        try:
+            with open(class_index_filename, "r", encoding="utf8") as class_index_file:
+                class_index_data = json.load(class_index_file)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            logging.warning("Invalid class index %s, ignored", class_index_filename)
+            return {}
+        return class_index_data.get("modules", {})
+
+    def save(self, class_index_filename):
+        os.makedirs(os.path.dirname(class_index_filename) or ".", exist_ok=True)
+        tmp_filename = f"{class_index_filename}.{os.getpid()}.tmp"
+        with open(tmp_filename, "w", encoding="utf8") as class_index_file:
+            json.dump({"modules": self.module_entries}, class_index_file)
+        os.replace(tmp_filename, class_index_filename)
+
+
+def test_class_index():
+    header_content = """
+class Geom_Geometry : public Standard_Transient {};
+DEFINE_STANDARD_HANDLE(Geom_Geometry, Standard_Transient)
+class Geom_Curve : public Geom_Geometry {
+public:
+    virtual Standard_Real FirstParameter() const = 0;
+};
+class Geom_Line : public Geom_Curve {};
+class gp_Pnt {};
+DEFINE_HARRAY1(Geom_HArray1OfLine, Geom_Array1OfLine)
+"""
+    context = GenerationContext("Geom", Registries())
+    cpp_header = CppHeaderParser.CppHeader(
+        adapt_header_file(context, header_content), "string"
+    )
+    class_index = ClassIndex()
+    class_index.add_header(
+        "Geom",
+        "Geom_Curve.hxx",
+        cpp_header.classes,
+        context.get_header_definitions(),
     )
-    header_content = header_content.replace(
-        "DECLARE_TOBJOCAF_PERSISTENCE", "//DECLARE_TOBJOCAF_PERSISTENCE"
+    # a class of another module, derived from a Geom class
+    class_index.add_header(
+        "GeomAdaptor",
+        "GeomAdaptor_Line.hxx",
+        {
+            "GeomAdaptor_Line": {
+                "name": "GeomAdaptor_Line",
+                "inherits": [{"class": "Geom_Line"}],
+                "abstract": False,
+            }
+        },
+        ([], {}, {}, {}),
     )
-    header_content = header_content.replace(
-        "DEFINE_DERIVED_ATTRIBUTE", "//DEFINE_DERIVED_ATTRIBUTE"
+    # the entries are the same once stored
+    class_index = ClassIndex(json.loads(json.dumps(class_index.module_entries)))
+    geom_line = class_index.get_class("Geom_Line")
+    assert geom_line["header"] == "Geom_Curve.hxx"
+    assert geom_line["bases"] == ["Geom_Curve"]
+    assert class_index.get_class("Geom_Curve")["abstract"]
+    # only looked up in its module, gp
+    assert class_index.get_class("gp_Pnt") is None
+    assert class_index.get_class("Geom_Circle") is None
+    assert class_index.lookup("standard_transients", "GeomAdaptor_Line")
+    assert class_index.lookup("standard_transients", "Geom_Line")
+    assert not class_index.lookup("standard_transients", "gp_Pnt")
+    assert class_index.lookup("standard_handles", "Geom_Geometry")
+    assert not class_index.lookup("standard_handles", "Geom_Line")
+    assert class_index.get_module_hclasses("harray1", "Geom") == {
+        "Geom_HArray1OfLine": "Geom_Array1OfLine"
+    }
+    assert class_index.get_module_hclasses("harray1", "gp") == {}
+    assert class_index.get_module_hclasses("harray1", "Geom2d") == {}
+    new_entries = {"Geom2d": {"fingerprint": None, "classes": {}}}
+    class_index.add_entries(new_entries)
+    assert class_index.pop_new_entries() == new_entries
+    assert class_index.pop_new_entries() == {}
+
+
+def test_get_class_module():
+    """The class index does not change the module of a class, the prefix
+    of its name, even if the class is defined by a header of another module
+    """
+    class_index = ClassIndex()
+    class_index.add_header(
+        "GeomAdaptor",
+        "GeomAdaptor_Line.hxx",
+        {
+            "Geom_OtherLine": {
+                "name": "Geom_OtherLine",
+                "inherits": [{"class": "GeomAdaptor_Curve"}],
+                "abstract": False,
+            }
+        },
+        ([], {}, {}, {}),
     )
-    # remove stuff that prevent CppHeaderPArser to work correctly
-    header_content = header_content.replace("DEFINE_STANDARD_ALLOC", "")
-    header_content = header_content.replace("Standard_EXPORT", "")
-    header_content = header_content.replace("Standard_NODISCARD", "")
-    # TODO : use the @deprecated python decorator to raise a Deprecation exception
-    # see https://github.com/tantale/deprecated
-    # each time this method is used
-    # then we look for Handle(Something) use
-    # and replace with opencascade::handle<Something>
-    outer = re.compile("Handle[\\s]*\\([\\w\\s]*\\)")
-    if matches := outer.findall(header_content):
-        for match in matches:
-            # matches are of the form :
-            # ['Handle(Graphic3d_Structure)',
-            # 'Handle(Graphic3d_DataStructureManager)']
-            match = match.replace(" ", "")
-            class_name = (match.split("Handle(")[1]).split(")")[0]
-            if class_name == "" or not class_name[0].isupper():
-                continue
-            header_content = header_content.replace(
-                match, f"opencascade::handle<{class_name}>"
+    classes = {
+        "GeomAdaptor_Curve": {"name": "GeomAdaptor_Curve", "inherits": []},
+        "GeomAdaptor_Line": {
+            "name": "GeomAdaptor_Line",
+            "inherits": [{"class": "Geom_OtherLine"}],
+        },
+    }
+    previous_class_index = CLASS_INDEX
+    results = []
+    try:
+        for index in [None, class_index]:
+            set_class_index(index)
+            context = GenerationContext("GeomAdaptor", Registries())
+            results.append(
+                (
+                    get_class_module("Geom_OtherLine"),
+                    check_dependency(context, "Handle(Geom_OtherLine)"),
+                    [
+                        klass["name"]
+                        for klass in build_inheritance_tree(context, classes)
+                    ],
+                )
             )
-    return header_content
+    finally:
+        set_class_index(previous_class_index)
+    assert results[0] == results[1]
+    assert results[0][0] == "Geom"
 
 
-def parse_header(header_filename):
-    """Use CppHeaderParser module to parse header_filename"""
-    with open(header_filename, "r", encoding="utf-8") as header_content:
-        adapted_header_content = adapt_header_file(header_content.read())
-        try:
-            cpp_header = CppHeaderParser.CppHeader(adapted_header_content, "string")
-        except CppHeaderParser.CppParseError as e:
-            error_message = f"Error: cannot parse {header_filename}\n"
-            error_message += f"Reason: {e}"
-            raise RuntimeError(error_message)
-    return cpp_header
+# set by the --no-class-index command line option
+CLASS_INDEX = None
+
+
+def set_class_index(class_index):
+    """Set the class index, ClassIndex or None"""
+    global CLASS_INDEX
+    CLASS_INDEX = class_index
+
+
+def get_class_index(class_index_filename):
+    """The class index, with the entries stored in class_index_filename
+    if not None. The modules are indexed when they are first needed
+    """
+    return ClassIndex(
+        (
+            ClassIndex.load(class_index_filename)
+            if class_index_filename is not None
+            else {}
+        ),
+        ClassIndex.get_index_key(),
+    )
+
+
+def index_current_module(module_name, measures):
+    """Index the module before its memory is tracked, so that the memory of
+    the module does not depend on whether it was indexed before
+    """
+    if CLASS_INDEX is not None:
+        with measures.timer("class_index"):
+            CLASS_INDEX.get_module_entry(module_name)
+
+
+def get_class_module(class_name):
+    """The module of a class: the class name prefix, as for its header"""
+    return class_name.split("_")[0]
 
 
 def filter_typedefs(typedef_dict):
@@ -1583,7 +2691,148 @@ def str_in(list_of_patterns, a_string):
     return any(patt in a_string for patt in list_of_patterns)
 
 
-def process_typedefs(typedefs_dict):
+# the maximum number of entries of each type adaptation cache
+TYPE_ADAPTATION_CACHE_SIZE = 8192
+# set by the --no-type-adaptation-cache command line option
+TYPE_ADAPTATION_CACHE = True
+
+
+def set_type_adaptation_cache(enabled):
+    """Enable or disable the type adaptation caches. Disabled caches
+    call the type adaptation functions each time
+    """
+    global TYPE_ADAPTATION_CACHE
+    TYPE_ADAPTATION_CACHE = enabled
+
+
+class TypeAdaptationCache:
+    """Memoize a type adaptation function, a pure function of a string, in
+    a least recently used cache of maxsize entries. The function returns
+    the warnings to log rather than logging them, so that they are logged
+    each time, by the caller. The cache is bypassed if the type adaptation
+    caches are disabled, see set_type_adaptation_cache
+    """
+
+    def __init__(self, function, maxsize=TYPE_ADAPTATION_CACHE_SIZE):
+        functools.update_wrapper(self, function)
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._counter_name = f"type_adaptation.{function.__name__.lstrip('_')}"
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __call__(self, type_str):
+        if not TYPE_ADAPTATION_CACHE:
+            return self.__wrapped__(type_str)
+        entries = self._entries
+        try:
+            result = entries[type_str]
+        except KeyError:
+            self._counts["misses"] += 1
+            result = entries[type_str] = self.__wrapped__(type_str)
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+                self._counts["evictions"] += 1
+            return result
+        entries.move_to_end(type_str)
+        self._counts["hits"] += 1
+        return result
+
+    def pop_counts(self):
+        """The hits, misses and evictions since the last call"""
+        counts = {event: value for event, value in self._counts.items() if value}
+        self._counts = dict.fromkeys(self._counts, 0)
+        return {self._counter_name: counts} if counts else {}
+
+    def clear(self):
+        self._entries.clear()
+
+
+def memoize_type_adaptation(function):
+    """Decorator, memoize function in a TypeAdaptationCache whose hits,
+    misses and evictions are counted as type_adaptation.<function name>
+    """
+    type_adaptation_cache = TypeAdaptationCache(function)
+    COUNTERS.add_source(type_adaptation_cache)
+    return type_adaptation_cache
+
+
+def test_type_adaptation_cache():
+    # memoized and unmemoized adaptations give the same results,
+    # computed once then taken from the cache
+    type_strs = [
+        "const Standard_Real",
+        "Standard_Real &",
+        "const TCollection_AsciiString &",
+        "const Standard_CString",
+        "const opencascade::handle<Geom_Curve> &",
+        "opencascade::handle < Geom_Surface >",
+        "const gp_Pnt &",
+        "Standard_IStream &",
+        "Standard_OStream & theStream",
+        "Standard_Integer & theIndex",
+        "GeomAbs_Shape & theContinuity",
+        "NCollection_Array1<gp_Pnt>",
+        "Handle_Geom_Curve",
+        "void",
+        "0",
+        "",
+    ]
+    default_value_strs = [
+        "Standard_True",
+        "Precision::Confusion()",
+        "opencascade::handle<Geom_Curve>()",
+        "0.5f",
+        "0L",
+        "NULL",
+    ]
+    for function, strs in [
+        (_adapt_param_type, type_strs),
+        (_adapt_byref_param_type_and_name, type_strs),
+        (_adapt_return_type, type_strs),
+        (_adapt_type_for_hint, type_strs),
+        (fix_type, type_strs),
+        (adapt_type_hint_default_value, default_value_strs),
+    ]:
+        memoized_function = TypeAdaptationCache(function.__wrapped__, maxsize=4)
+        for _ in range(2):
+            for type_str in strs:
+                assert memoized_function(type_str) == function.__wrapped__(type_str)
+        assert len(memoized_function._entries) == 4
+    memoized_fix_type = TypeAdaptationCache(fix_type.__wrapped__, maxsize=2)
+    memoized_fix_type("Standard_Real")
+    memoized_fix_type("Standard_Integer")
+    memoized_fix_type("Standard_Real")
+    memoized_fix_type("Standard_Boolean")
+    # the least recently used entry is evicted
+    assert list(memoized_fix_type._entries) == ["Standard_Real", "Standard_Boolean"]
+    assert memoized_fix_type.pop_counts() == {
+        "type_adaptation.fix_type": {"hits": 1, "misses": 3, "evictions": 1}
+    }
+    assert fix_type.maxsize == TYPE_ADAPTATION_CACHE_SIZE
+
+
+def test_type_adaptation_cache_switch():
+    # disabled, a cache calls the function each time, and is left as is
+    memoized_fix_type = TypeAdaptationCache(fix_type.__wrapped__, maxsize=4)
+    type_strs = ["const Standard_Real", "Standard_Integer &", "Handle_Geom_Curve"]
+    type_adaptation_cache = TYPE_ADAPTATION_CACHE
+    try:
+        for enabled in [False, True, True]:
+            set_type_adaptation_cache(enabled)
+            for type_str in type_strs:
+                assert memoized_fix_type(type_str) == fix_type.__wrapped__(type_str)
+            if not enabled:
+                assert not memoized_fix_type._entries
+                assert memoized_fix_type.pop_counts() == {}
+    finally:
+        set_type_adaptation_cache(type_adaptation_cache)
+    assert list(memoized_fix_type._entries) == type_strs
+    assert memoized_fix_type.pop_counts() == {
+        "type_adaptation.fix_type": {"hits": 3, "misses": 3}
+    }
+
+
+def process_typedefs(context, typedefs_dict):
     """Take a typedef dictionary and returns a SWIG definition string"""
     templates_str = ""
     typedef_pyi_str = ""  # NewTypes related to typedef aliases
@@ -1611,10 +2860,12 @@ def process_typedefs(typedefs_dict):
                 )
                 continue
             module = h_typ.split("_")[0]
-            if module != CURRENT_MODULE:
+            if module != context.module_name:
                 # need to be added to the list of dependent object
-                if (module not in PYTHON_MODULE_DEPENDENCY) and (is_module(module)):
-                    PYTHON_MODULE_DEPENDENCY.append(module)
+                if (module not in context.python_module_dependency) and (
+                    is_module(module)
+                ):
+                    context.python_module_dependency.append(module)
 
     sorted_list_of_typedefs = sorted(filtered_typedef_dict.keys())
     for typedef_value in sorted_list_of_typedefs:
@@ -1644,11 +2895,11 @@ def process_typedefs(typedefs_dict):
             #
             typedef_module_name = typedef_type.split("_")[0]
             if is_module(typedef_module_name):
-                if CURRENT_MODULE == typedef_module_name:
+                if context.module_name == typedef_module_name:
                     typedef_aliases_str += f"{typedef_value}={typedef_type}\n"
                 else:
                     typedef_aliases_str += f"{typedef_value}=OCC.Core.{typedef_module_name}.{typedef_type}\n"
-        check_dependency(typedef_type.split()[0])
+        check_dependency(context, typedef_type.split()[0])
         # Define a new type, only for aliases
         type_to_define = typedef_type
         match_1 = [
@@ -1722,7 +2973,7 @@ def adapt_enum_value(enum_value):
     return enum_value.split("int ( ")[1].split(")")[0].strip()
 
 
-def process_enums(enums_list):
+def process_enums(context, enums_list):
     """Take an enum list and generate a compliant SWIG string
     Then create a python class that mimics the enum
     for instance, from the TopAbs_Orientation.hxx header, we have
@@ -1777,8 +3028,7 @@ def process_enums(enums_list):
             python_proxy = False
         else:
             enum_name = enum["name"]
-            if enum_name not in ALL_ENUMS:
-                ALL_ENUMS.append(enum_name)
+            context.enums[enum_name] = None
 
         if enum_name in ENUMS_TO_EXLUDE:
             logging.info("Skipping Enum: %s", enum_name)
@@ -1791,7 +3041,7 @@ def process_enums(enums_list):
             enum_pyi_str += f"\nclass {enum_name}(IntEnum):\n"
         for enum_value in enum["values"]:
             adapted_enum_value = adapt_enum_value(enum_value["value"])
-            if CURRENT_MODULE == "Quantity":
+            if context.module_name == "Quantity":
                 # special case for Quantity_Color
                 if isinstance(adapted_enum_value, str):
                     # if adapted_enum_value.isalpha():
@@ -1820,15 +3070,20 @@ def process_enums(enums_list):
     return enum_str + enum_python_proxies, enum_pyi_str
 
 
-def is_return_type_enum(return_type):
+def is_return_type_enum(context, return_type):
     """This method returns True is an enum is returned. For instance:
     BRepCheck_Status &
     BRepCheck_Status
     """
-    return any(r in ALL_ENUMS for r in return_type.split())
+    return any(context.is_enum(r) for r in return_type.split())
 
 
-def adapt_param_type(param_type):
+@memoize_type_adaptation
+def _adapt_param_type(param_type):
+    """adapt_param_type, without the dependency check. Returns
+    the adapted type and the warnings
+    """
+    warnings = []
     param_type = param_type.strip()
     if "CString" in param_type:
         param_type = param_type.replace("const Standard_CString", "Standard_CString")
@@ -1856,21 +3111,28 @@ def adapt_param_type(param_type):
             elif pattern == param_type:
                 param_type = param_type.replace(pattern, "int")
             else:
-                logging.warning("Unknown pattern in Standard_Integer typedef")
+                warnings.append(("Unknown pattern in Standard_Integer typedef",))
     # replace Standard_IStream with std::istream
     # so that SWIG template can apply
     param_type = param_type.replace("Standard_IStream", "std::istream")
     param_type = param_type.replace("Standard_SStream", "std::stringstream")
     param_type = param_type.strip()
-    check_dependency(param_type)
+    return param_type, tuple(warnings)
+
+
+def adapt_param_type(context, param_type):
+    param_type, warnings = _adapt_param_type(param_type)
+    for warning in warnings:
+        logging.warning(*warning)
+    check_dependency(context, param_type)
     return param_type
 
 
-def adapt_param_type_and_name(param_type_and_name):
-    """We sometime need to replace some argument type and name
-    to properly deal with byref values
+@memoize_type_adaptation
+def _adapt_byref_param_type_and_name(param_type_and_name):
+    """The adapted type and name of the bool, int, double, stream and
+    string parameters passed by reference, None for other parameters
     """
-    global ALL_BYREF_ENUMS
     # bool, int and double passed by reference in c++
     if (
         ("Standard_Real &" in param_type_and_name)
@@ -1908,46 +3170,57 @@ def adapt_param_type_and_name(param_type_and_name):
         adapted_param_type_and_name = (
             "opencascade::handle<TCollection_HAsciiString> &OutValue"
         )
+    else:
+        adapted_param_type_and_name = None
+    return adapted_param_type_and_name
+
+
+def adapt_param_type_and_name(context, param_type_and_name):
+    """We sometime need to replace some argument type and name
+    to properly deal with byref values
+    """
+    adapted_param_type_and_name = _adapt_byref_param_type_and_name(param_type_and_name)
     # some enums can also be passed as reference, among them
     # we look for getenirc patterns such as
     # TopAbs_Orientation &Or
     # FairCurve_AnalysisCode &Code
     # etc.
-    elif (param_type_and_name.split()[0] in ALL_ENUMS) and (
-        param_type_and_name.split()[1].startswith("&")
-    ):
-        enum_name = param_type_and_name.split()[0]
-        if enum_name not in ALL_BYREF_ENUMS:
-            ALL_BYREF_ENUMS.append(enum_name)
-        logging.info(
-            "Enum passed by reference: %s changed to %s &OutValue",
-            param_type_and_name,
-            enum_name,
-        )
-        adapted_param_type_and_name = f"{enum_name} &OutValue"
-    else:
-        adapted_param_type_and_name = param_type_and_name
+    if adapted_param_type_and_name is None:
+        if context.is_enum(param_type_and_name.split()[0]) and (
+            param_type_and_name.split()[1].startswith("&")
+        ):
+            enum_name = param_type_and_name.split()[0]
+            context.byref_enums[enum_name] = None
+            logging.info(
+                "Enum passed by reference: %s changed to %s &OutValue",
+                param_type_and_name,
+                enum_name,
+            )
+            adapted_param_type_and_name = f"{enum_name} &OutValue"
+        else:
+            adapted_param_type_and_name = param_type_and_name
     if "& &" in adapted_param_type_and_name:
         adapted_param_type_and_name = adapted_param_type_and_name.replace("& &", "&")
     return adapted_param_type_and_name
 
 
 def test_adapt_param_type_and_name():
+    context = GenerationContext("gp", Registries())
     p1 = "Standard_Real & Xp"
-    ad_p1 = adapt_param_type_and_name(p1)
+    ad_p1 = adapt_param_type_and_name(context, p1)
     assert ad_p1 == "Standard_Real &OutValue"
     p2 = "Standard_Integer & I"
-    ad_p2 = adapt_param_type_and_name(p2)
+    ad_p2 = adapt_param_type_and_name(context, p2)
     assert ad_p2 == "Standard_Integer &OutValue"
     p3 = "int & j"
-    ad_p3 = adapt_param_type_and_name(p3)
+    ad_p3 = adapt_param_type_and_name(context, p3)
     assert ad_p3 == "Standard_Integer &OutValue"
     p4 = "double & x"
-    ad_p4 = adapt_param_type_and_name(p4)
+    ad_p4 = adapt_param_type_and_name(context, p4)
     assert ad_p4 == "Standard_Real &OutValue"
 
 
-def check_dependency(item):
+def check_dependency(context, item):
     """For any type or class name passe to this function,
     returns the module name to which it belongs.
     a. Handle_Geom_Curve -> Geom
@@ -1980,14 +3253,14 @@ def check_dependency(item):
     # or opencascade::handle<Some_Class>
     if item.startswith("Handle ("):
         item = item.split("Handle ( ")[1].split(")")[0].strip()
-        module = item.split("_")[0]
+        module = get_class_module(item)
     elif item.startswith("Handle_"):
-        module = item.split("_")[1]
+        module = get_class_module(item[7:])
     elif item.startswith("opencascade::handle<"):
         item = item.split("<")[1].split(">")[0].strip()
-        module = item.split("_")[0]
+        module = get_class_module(item)
     elif item.count("_") > 0:  # Standard_Integer or NCollection_CellFilter_InspectorXYZ
-        module = item.split("_")[0]
+        module = get_class_module(item)
     else:  # do nothing, it's a trap
         return False
     # we strip the module, who knows, there maybe trailing spaces
@@ -1995,26 +3268,30 @@ def check_dependency(item):
     # TODO : is the following line really necessary ?
     if module == "Font":  # forget about Font dependencies, issues with FreeType
         return True
-    if module != CURRENT_MODULE:
+    if module != context.module_name:
         # need to be added to the list of dependent object
-        if (module not in PYTHON_MODULE_DEPENDENCY) and (is_module(module)):
-            PYTHON_MODULE_DEPENDENCY.append(module)
+        if (module not in context.python_module_dependency) and (is_module(module)):
+            context.python_module_dependency.append(module)
     return module
 
 
 def test_check_dependency():
-    dep1 = check_dependency("Handle_Geom_Curve")
+    context = GenerationContext("gp", Registries())
+    dep1 = check_dependency(context, "Handle_Geom_Curve")
     assert dep1 == "Geom"
-    dep2 = check_dependency("Handle ( Geom2d_Curve)")
+    dep2 = check_dependency(context, "Handle ( Geom2d_Curve)")
     assert dep2 == "Geom2d"
-    dep3 = check_dependency("opencascade::handle<TopoDS_TShape>")
+    dep3 = check_dependency(context, "opencascade::handle<TopoDS_TShape>")
     assert dep3 == "TopoDS"
-    dep4 = check_dependency("Standard_Integer")
+    dep4 = check_dependency(context, "Standard_Integer")
     assert dep4 == "Standard"
 
 
-def adapt_return_type(return_type):
-    """adapt the type definition"""
+@memoize_type_adaptation
+def _adapt_return_type(return_type):
+    """adapt_return_type, without the dependency and enum checks. Returns
+    the adapted type, and the type wrapped as a copy or None
+    """
     replaces = [
         "public",
         "protected : private",  # TODO: CppHeaderParser may badly parse these methods
@@ -2031,11 +3308,11 @@ def adapt_return_type(return_type):
         and ("Surface" in return_type or "Curve" in return_type)
         and "handle" not in return_type
     ):
-        logging.warning("%s wrapped as a copy", return_type)
+        copied_type = return_type
         return_type = return_type.replace("const", "")
         return_type = return_type.replace("&", "")
         return_type = return_type.strip()
-        return return_type
+        return return_type, copied_type
     # replace Standard_CString with char *
     return_type = return_type.replace("const Standard_CString", "Standard_CString")
     return_type = return_type.replace("Standard_CString &", "Standard_CString")
@@ -2054,16 +3331,26 @@ def adapt_return_type(return_type):
         "TopoDS" in return_type
     ):
         return_type = return_type.replace("&", "").strip()
-    check_dependency(return_type)
+    return return_type, None
+
+
+def adapt_return_type(context, return_type):
+    """adapt the type definition"""
+    return_type, copied_type = _adapt_return_type(return_type)
+    if copied_type is not None:
+        logging.warning("%s wrapped as a copy", copied_type)
+        return return_type
+    check_dependency(context, return_type)
     # check is it is an enum
-    if is_return_type_enum(return_type) and "&" in return_type:
+    if is_return_type_enum(context, return_type) and "&" in return_type:
         # remove the reference
         return_type = return_type.replace("&", "")
     return return_type
 
 
 def test_adapt_return_type():
-    adapted_2 = adapt_return_type("gp_Dir &")
+    context = GenerationContext("gp", Registries())
+    adapted_2 = adapt_return_type(context, "gp_Dir &")
     assert adapted_2 == "gp_Dir"
 
 
@@ -2089,7 +3376,7 @@ def get_module_docstring(module_name):
     return module_docstring
 
 
-def process_function_docstring(f):
+def process_function_docstring(context, f):
     """Create the docstring, for the function f,
     that will be used by the wrapper.
     For that, first check the function parameters and type
@@ -2108,7 +3395,7 @@ def process_function_docstring(f):
         # we add a "Parameters section"
         parameters_string += "\nParameters\n----------\n"
         for param in f["parameters"]:
-            param_type = adapt_param_type(param["type"])
+            param_type = adapt_param_type(context, param["type"])
             # remove const and &
             param_type = fix_type(param_type)
             # we change opencascade::handle<XXX> & to XXX
@@ -2125,7 +3412,7 @@ def process_function_docstring(f):
                 param_type = "str"
             # check the &OutValue
             the_type_and_name = param["type"] + param["name"]
-            if "OutValue" in adapt_param_type_and_name(the_type_and_name):
+            if "OutValue" in adapt_param_type_and_name(context, the_type_and_name):
                 # this parameter has to be added to the
                 # returns, not the parameters of the python method
                 ret.append(f'{param["name"]}: {param_type}')
@@ -2140,7 +3427,7 @@ def process_function_docstring(f):
 
     # return types:
     returns_string = "Return\n-------\n"
-    method_return_type = adapt_return_type(f["rtnType"])
+    method_return_type = adapt_return_type(context, f["rtnType"])
     if ret:  # at least on by ref parameter
         for r in ret:
             returns_string += f"{r}\n"
@@ -2278,46 +3565,46 @@ def filter_member_functions(
     return constructors, other_methods
 
 
-def adapt_type_for_hint(type_str):
-    """convert c++ types to python types, for type hints
-    Returns False if there's no possible type
+@memoize_type_adaptation
+def _adapt_type_for_hint(type_str):
+    """adapt_type_for_hint, returns the type hint and the warning
+    to log, None if there is no warning
     """
     if type_str == "0":  # huu ? in XCAFDoc, skip it
-        logging.warning("    [TypeHint] Skipping unknown type, 0")
-        return False
+        return False, ("    [TypeHint] Skipping unknown type, 0",)
     if "void" in type_str or type_str in [""]:
-        return "None"
+        return "None", None
     if " int" in type_str:  # const int, unsigned int etc.
-        return "int"
+        return "int", None
     if "char *" in type_str or "CString" in type_str:
-        return "str"
+        return "str", None
     if "bool" in type_str:
-        return "bool"
+        return "bool", None
     if "float" in type_str:
-        return "float"
+        return "float", None
     if "integer *" in type_str:
-        return "int"
+        return "int", None
     if "doublereal" in type_str:
-        return "float"
+        return "float", None
     if type_str == "int":
-        return "int"
+        return "int", None
     if type_str == "int *":
-        return "int"
+        return "int", None
     if type_str == "double":
-        return "float"
+        return "float", None
     if type_str == "const double":
-        return "float"
+        return "float", None
     if type_str == "double *":
-        return "float"
+        return "float", None
     if type_str == "opencascade::handle<TCollection_HAsciiString> &OutValue":
-        return "str"
+        return "str", None
     if type_str == "std::istream &":
-        return "str"
+        return "str", None
     if "std::ostream &" in type_str:
-        return "str"
+        return "str", None
     if "_" not in type_str:  # TODO these are special cases, e.g. nested classes
-        logging.warning("    [TypeHint] Skipping type %s, should contain _", type_str)
-        return False  # returns a boolean to prevent type hint creation, the type will not be found
+        # returns a boolean to prevent type hint creation, the type will not be found
+        return False, ("    [TypeHint] Skipping type %s, should contain _", type_str)
     # we only keep what is
     for tp in type_str.split(" "):
         if "_" in tp:
@@ -2338,25 +3625,33 @@ def adapt_type_for_hint(type_str):
     if type_str.startswith("opencascade::handle<"):
         type_str = type_str[20:].split(">")[0].strip()
     if ":" in type_str:
-        logging.warning("    [TypeHint] Skip type %s, because of trailing :", type_str)
-        return False
+        return False, ("    [TypeHint] Skip type %s, because of trailing :", type_str)
     if "_" in type_str and not is_module(type_str.split("_")[0]):
-        logging.warning(
+        return False, (
             "    [TypeHint] Skipping unknown type %s, %s not in module list",
             type_str,
             type_str.split("_")[0],
         )
-        return False
     if type_str.count("<") >= 1:  # at least one <, it's a template
-        logging.warning(
-            "    [TypeHint] Skipping type %s, seems to be a template", type_str
+        return False, (
+            "    [TypeHint] Skipping type %s, seems to be a template",
+            type_str,
         )
-        return False
 
     if type_str in ["TCollection_AsciiString", "TCollection_ExtendedString"]:
         type_str = "str"
 
-    return type_str
+    return type_str, None
+
+
+def adapt_type_for_hint(type_str):
+    """convert c++ types to python types, for type hints
+    Returns False if there's no possible type
+    """
+    type_hint, warning = _adapt_type_for_hint(type_str)
+    if warning is not None:
+        logging.warning(*warning)
+    return type_hint
 
 
 def get_classname_from_handle(handle_name):
@@ -2402,6 +3697,7 @@ def adapt_type_hint_parameter_name(param_name_str):
     return new_param_name, success
 
 
+@memoize_type_adaptation
 def adapt_type_hint_default_value(default_value_str):
     """default values such as Standard_True etc. must be
     converted to correct python values
@@ -2480,7 +3776,7 @@ def get_function_md5_signature(f):
     return hashlib.md5(bytes(function_signature, encoding="utf8")).hexdigest()
 
 
-def process_function(f, overload=False):
+def process_function(context, f, overload=False):
     """
     Processes a C++ function represented as a dictionary and generates SWIG interface code
     for creating Python bindings. This method handles various aspects of function wrapping
@@ -2489,6 +3785,9 @@ def process_function(f, overload=False):
     with Python type hints for enhanced development experience.
 
     Parameters:
+    - context (GenerationContext): The module being processed. Its counter of processed
+      methods is incremented for each wrapped function, and the static methods are
+      added to its list of deprecated static functions.
     - f (dict): A dictionary containing information about the C++ function to be processed.
       The dictionary must include keys such as 'name', 'template', 'destructor', 'returns',
       'rtnType', 'parameters', etc., representing the function's signature and characteristics.
@@ -2502,14 +3801,7 @@ def process_function(f, overload=False):
       hints for the function, intended for use in .pyi stub files. In cases where the function
       cannot be wrapped or is intentionally skipped, the returned strings may be empty or
       indicative of the reason for skipping.
-
-    Global Variables:
-    - NB_TOTAL_METHODS (int): A counter tracking the total number of methods processed. This
-      function increments the counter for each successfully processed function.
-    - CURRENT_MODULE_PYI_STATIC_METHODS_ALIASES (list): A list maintaining aliases for static
-      methods in the current module, used for generating Python type hints.
     """
-    global NB_TOTAL_METHODS, CURRENT_MODULE_PYI_STATIC_METHODS_ALIASES
     # compute signature md5
     function_signature_md5 = get_function_md5_signature(f)
     if f["template"]:
@@ -2539,7 +3831,7 @@ def process_function(f, overload=False):
     #
     if f["static"] and f["parent"] is not None:
         parent_class_name = f["parent"]["name"]
-        if parent_class_name == CURRENT_MODULE:
+        if parent_class_name == context.module_name:
             parent_class_name = parent_class_name.lower()
     else:
         parent_class_name = None
@@ -2578,7 +3870,9 @@ def process_function(f, overload=False):
             )  # not hint for operator
 
     # at this point, we can increment the method counter
-    NB_TOTAL_METHODS += 1
+    context.nb_methods += 1
+    if overload:
+        context.nb_overloads += 1
 
     # special wrapper for DumpJson and InitFromJson
     if function_name == "DumpJson":
@@ -2590,7 +3884,10 @@ def process_function(f, overload=False):
     # we only wrap free functions that are in the current module namespace
     function_namespace = f["namespace"]
     function_parent_class_name = f["parent"]["name"] if f["parent"] is not None else ""
-    if function_namespace[:-2] != CURRENT_MODULE and function_parent_class_name == "":
+    if (
+        function_namespace[:-2] != context.module_name
+        and function_parent_class_name == ""
+    ):
         return "", ""
 
     # enable autocompactargs feature to enable compilation with swig>3.0.3
@@ -2598,7 +3895,7 @@ def process_function(f, overload=False):
     str_function += f"\t\t/****** md5 signature: {function_signature_md5} ******/\n"
     str_function += f'\t\t%feature("compactdefaultargs") {function_name};\n'
 
-    str_function += process_function_docstring(f)
+    str_function += process_function_docstring(context, f)
     str_function += "\t\t"
     # return type
     # Careful: for constructors, we have to remove the "void"
@@ -2609,7 +3906,7 @@ def process_function(f, overload=False):
     if f["constructor"]:
         return_type = ""
     else:
-        return_type = adapt_return_type(f["rtnType"])
+        return_type = adapt_return_type(context, f["rtnType"])
     if f["virtual"]:
         return_type = "virtual " + return_type
     if f["static"] and "static" not in return_type:
@@ -2634,11 +3931,15 @@ def process_function(f, overload=False):
         getter_params_only_names = []
         getter_param_hints = ["self"]
         for param in f["parameters"]:
-            param_type_and_name = f"{adapt_param_type(param['type'])} {param['name']}"
+            param_type_and_name = (
+                f"{adapt_param_type(context, param['type'])} {param['name']}"
+            )
             getter_params_type_and_names.append(param_type_and_name)
             getter_params_only_names.append(param["name"])
             # process hints
-            type_for_hint = adapt_type_for_hint(adapt_param_type(param["type"]))
+            type_for_hint = adapt_type_for_hint(
+                adapt_param_type(context, param["type"])
+            )
             getter_param_hints.append(f"{param['name']}: {type_for_hint}")
 
         setter_params_type_and_names = getter_params_type_and_names + [
@@ -2689,7 +3990,7 @@ def process_function(f, overload=False):
     # num_parameters = len(f["parameters"])
     for param in f["parameters"]:
         param_string = ""
-        param_type = adapt_param_type(param["type"])
+        param_type = adapt_param_type(context, param["type"])
 
         if "Handle_T &" in param_type:
             return (
@@ -2709,7 +4010,9 @@ def process_function(f, overload=False):
         else:
             param_type_and_name = [f"{param_type}", f"{param['name']}"]
 
-        param_string += adapt_param_type_and_name(" ".join(param_type_and_name))
+        param_string += adapt_param_type_and_name(
+            context, " ".join(param_type_and_name)
+        )
 
         if "defaultValue" in param:
             def_value = adapt_default_value_parmlist(param)
@@ -2753,7 +4056,7 @@ def process_function(f, overload=False):
                     and "<" not in parent_class_name
                     and function_name.isalnum()
                 ):
-                    DEPRECATED_STATIC_FUNCTIONS.append(
+                    context.deprecated_static_functions.append(
                         (parent_class_name, function_name)
                     )
             str_typehint += f"    def {function_name}("
@@ -2765,7 +4068,7 @@ def process_function(f, overload=False):
                     canceled = True
                     break
                 # check if there is some OutValue
-                ov = adapt_param_type_and_name(" ".join(par))
+                ov = adapt_param_type_and_name(context, " ".join(par))
                 if "OutValue" in ov:
                     type_to_add = f"{adapt_type_for_hint(ov)}"
                     if types_returned[0] == "None":
@@ -2806,18 +4109,18 @@ def process_function(f, overload=False):
     return str_function, str_typehint
 
 
-def process_free_functions(free_functions_list):
+def process_free_functions(context, free_functions_list):
     """process a string for free functions"""
     str_free_functions = ""
     sorted_free_functions_list = sorted(free_functions_list, key=itemgetter("name"))
     for free_function in sorted_free_functions_list:
-        ok_to_wrap = process_function(free_function)
+        ok_to_wrap = process_function(context, free_function)
         if ok_to_wrap:
             str_free_functions += ok_to_wrap
     return str_free_functions
 
 
-def process_constructors(constructors_list):
+def process_constructors(context, constructors_list):
     """this function process constructors.
     The constructors_list is a list of constructors
     """
@@ -2839,14 +4142,14 @@ def process_constructors(constructors_list):
     str_functions = ""
     type_hints = ""
     for constructor in constructors_list:
-        ok_to_wrap, ok_hints = process_function(constructor, need_overload)
+        ok_to_wrap, ok_hints = process_function(context, constructor, need_overload)
         if ok_to_wrap:
             str_functions += ok_to_wrap
             type_hints += ok_hints
     return str_functions, type_hints
 
 
-def process_methods(methods_list):
+def process_methods(context, methods_list):
     """process a list of public process_methods"""
     str_functions = ""
     type_hints = ""
@@ -2854,19 +4157,13 @@ def process_methods(methods_list):
     sorted_methods_list = sorted(methods_list, key=itemgetter("name"))
     # create a dict to map function names and the number of occurrences,
     # to determine whether or not use the @overload decorator
+    names_count = Counter(function["name"] for function in sorted_methods_list)
     for function in sorted_methods_list:
         # don't process friend methods
-        need_overload = False
         if not function["friend"]:
             # check if this method is many times in the function list
-            names_count = 0
-            function_name = function["name"]
-            for f in sorted_methods_list:
-                if f["name"] == function_name:
-                    names_count += 1
-            if names_count > 1:
-                need_overload = True
-            ok_to_wrap, ok_hints = process_function(function, need_overload)
+            need_overload = names_count[function["name"]] > 1
+            ok_to_wrap, ok_hints = process_function(context, function, need_overload)
             if ok_to_wrap:
                 str_functions += ok_to_wrap
                 type_hints += ok_hints
@@ -2931,13 +4228,12 @@ def class_can_have_default_constructor(klass):
     return True
 
 
-def build_inheritance_tree(classes_dict):
+def build_inheritance_tree(context, classes_dict):
     """From the classes dict, return a list of classes
     with the class ordered from the most abstract to
     the more specialized. The more abstract will be
     processed first.
     """
-    global ALL_STANDARD_TRANSIENTS
     # first, we build two dictionaries
     # the first one, level_0_classes
     # contain class names that does not inherit from
@@ -2963,7 +4259,7 @@ def build_inheritance_tree(classes_dict):
             upper_class_name = upper_classes[0]["class"]
             # if the upper class depends on another module
             # add it to the level 0 list.
-            if upper_class_name.split("_")[0] != CURRENT_MODULE:
+            if get_class_module(upper_class_name) != context.module_name:
                 level_0_classes.append(class_name)
             # else build the inheritance tree
             else:
@@ -2971,17 +4267,17 @@ def build_inheritance_tree(classes_dict):
         elif nbr_upper_classes == 2:
             # if one, or the other
             upper_class_name_1 = upper_classes[0]["class"]
-            class_1_module = upper_class_name_1.split("_")[0]
+            class_1_module = get_class_module(upper_class_name_1)
             upper_class_name_2 = upper_classes[1]["class"]
-            class_2_module = upper_class_name_2.split("_")[0]
-            if class_1_module == upper_class_name_2 == CURRENT_MODULE:
+            class_2_module = get_class_module(upper_class_name_2)
+            if class_1_module == upper_class_name_2 == context.module_name:
                 logging.warning(
                     "This is a special case, where the 2 ancestors belong the same module. Class %s skipped.",
                     class_name,
                 )
-            if class_1_module == CURRENT_MODULE:
+            if class_1_module == context.module_name:
                 inheritance_dict[class_name] = upper_class_name_1
-            elif class_2_module == CURRENT_MODULE:
+            elif class_2_module == context.module_name:
                 inheritance_dict[class_name] = upper_class_name_2
             elif (
                 upper_class_name_1 == upper_class_name_2
@@ -3006,14 +4302,22 @@ def build_inheritance_tree(classes_dict):
     # first we fill in with level_0:
     for class_name in level_0_classes:
         inheritance_depth[class_name] = 0
-    upper_classes = inheritance_dict.values()
+    # the depth of each class of an ancestors chain is computed once
+    chain_depths = {}
     for base_class_name in inheritance_dict:
+        chain = []
         tmp = base_class_name
-        i = 0
-        while tmp in inheritance_dict:
+        while tmp in inheritance_dict and tmp not in chain_depths:
+            if tmp in chain:
+                logging.warning("Class %s inherits from itself.", tmp)
+                break
+            chain.append(tmp)
             tmp = inheritance_dict[tmp]
-            i += 1
-        inheritance_depth[base_class_name] = i
+        depth = chain_depths.get(tmp, 0)
+        for class_name in reversed(chain):
+            depth += 1
+            chain_depths[class_name] = depth
+    inheritance_depth.update(chain_depths)
     # after that, we traverse the inheritance depth dict
     # to order classes names according to their depth.
     # first classes with level 0, then 1, 2 etc.
@@ -3026,20 +4330,52 @@ def build_inheritance_tree(classes_dict):
         if class_name in classes_dict:  # TODO: should always be the case!
             class_list.append(classes_dict[class_name])
     # Then we build the list of all classes that inherit from Standard_Transient
-    # at some point. These classes will need the %wrap_handle and %make_alias_macros
+    # at some point. These classes will need the %wrap_handle and %make_alias_macros.
+    # The ancestors chain of a class is followed until a Standard_Transient
+    # class is found, what is found for each ancestor is kept
+    upper_class_names = {
+        klass["name"]: klass["inherits"][0]["class"]
+        for klass in classes_dict.values()
+        if klass["inherits"]
+    }
+    inherits_transient = {}
     for klass in class_list:
-        upper_class = klass["inherits"]
         class_name = klass["name"]
-        if upper_class:
-            upper_class_name = klass["inherits"][0]["class"]
-            if upper_class_name in ALL_STANDARD_TRANSIENTS:
-                # this class inherits from a Standard_Transient base class
-                # so we add it to the ALL_STANDARD_TRANSIENTS list:
-                if klass not in ALL_STANDARD_TRANSIENTS:
-                    ALL_STANDARD_TRANSIENTS.append(class_name)
+        if class_name not in upper_class_names:
+            continue
+        chain = []
+        tmp = upper_class_names[class_name]
+        while tmp not in inherits_transient:
+            chain.append(tmp)
+            if context.is_standard_transient(tmp):
+                is_transient = True
+                break
+            if tmp not in upper_class_names or upper_class_names[tmp] in chain:
+                is_transient = False
+                break
+            tmp = upper_class_names[tmp]
+        else:
+            is_transient = inherits_transient[tmp]
+        for ancestor_name in chain:
+            inherits_transient[ancestor_name] = is_transient
+        if is_transient:
+            # this class inherits from a Standard_Transient base class
+            # so we add it to the standard transients list:
+            context.standard_transients[class_name] = None
+            inherits_transient[class_name] = True
     return class_list
 
 
+def get_inheritance_tree(context, classes_dict):
+    """build_inheritance_tree, computed once for the module and
+    shared by process_handles and process_classes
+    """
+    if context.inheritance_tree is None:
+        context.inheritance_tree = build_inheritance_tree(context, classes_dict)
+    return context.inheritance_tree
+
+
+@memoize_type_adaptation
 def fix_type(type_str):
     """used in docstrings"""
     type_str = type_str.replace("Standard_Boolean &", "bool")
@@ -3054,61 +4390,61 @@ def fix_type(type_str):
     return type_str
 
 
-def process_harray1():
+def process_harray1(context):
     """special wrapper for NCollection_HArray1
     Returns both the definition and the hint
     """
     wrapper_str = "/* harray1 classes */\n"
     pyi_str = "\n# harray1 classes\n"
-    for HClassName in ALL_HARRAY1:
-        if HClassName.startswith(CURRENT_MODULE + "_"):
-            array1_type = ALL_HARRAY1[HClassName]
-            wrapper_str += HARRAY1_TEMPLATE.substitute(
-                {"HClassName": f"{HClassName}", "Array1Type": f"{array1_type}"}
-            )
-            # type hint
-            pyi_str += HARRAY1_TEMPLATE_PYI.substitute(
-                {"HClassName": f"{HClassName}", "Array1Type": f"{array1_type}"}
-            )
+    module_harray1 = context.get_harray1()
+    for HClassName in module_harray1:
+        array1_type = module_harray1[HClassName]
+        wrapper_str += HARRAY1_TEMPLATE.substitute(
+            {"HClassName": f"{HClassName}", "Array1Type": f"{array1_type}"}
+        )
+        # type hint
+        pyi_str += HARRAY1_TEMPLATE_PYI.substitute(
+            {"HClassName": f"{HClassName}", "Array1Type": f"{array1_type}"}
+        )
     return wrapper_str, pyi_str
 
 
-def process_harray2():
+def process_harray2(context):
     wrapper_str = "/* harray2 classes */"
     pyi_str = "# harray2 classes\n"
-    for HClassName in ALL_HARRAY2:
-        if HClassName.startswith(CURRENT_MODULE + "_"):
-            array2_type = ALL_HARRAY2[HClassName]
-            wrapper_str += HARRAY2_TEMPLATE.substitute(
-                {"HClassName": f"{HClassName}", "Array2Type": f"{array2_type}"}
-            )
-            # type hint
-            pyi_str += HARRAY2_TEMPLATE_PYI.substitute(
-                {"HClassName": f"{HClassName}", "Array2Type": f"{array2_type}"}
-            )
+    module_harray2 = context.get_harray2()
+    for HClassName in module_harray2:
+        array2_type = module_harray2[HClassName]
+        wrapper_str += HARRAY2_TEMPLATE.substitute(
+            {"HClassName": f"{HClassName}", "Array2Type": f"{array2_type}"}
+        )
+        # type hint
+        pyi_str += HARRAY2_TEMPLATE_PYI.substitute(
+            {"HClassName": f"{HClassName}", "Array2Type": f"{array2_type}"}
+        )
     wrapper_str += "\n"
     return wrapper_str, pyi_str
 
 
-def process_hsequence():
+def process_hsequence(context):
     wrapper_str = "/* hsequence classes */"
     pyi_str = "# hsequence classes\n"
-    for HClassName in ALL_HSEQUENCE:
-        if HClassName.startswith(CURRENT_MODULE + "_"):
-            sequence_type = ALL_HSEQUENCE[HClassName]
-            wrapper_str += HSEQUENCE_TEMPLATE.substitute(
-                {"HClassName": f"{HClassName}", "SequenceType": f"{sequence_type}"}
-            )
-            # type hint
-            pyi_str += HSEQUENCE_TEMPLATE_PYI.substitute(
-                {"HClassName": f"{HClassName}", "SequenceType": f"{sequence_type}"}
-            )
+    module_hsequence = context.get_hsequence()
+    for HClassName in module_hsequence:
+        sequence_type = module_hsequence[HClassName]
+        wrapper_str += HSEQUENCE_TEMPLATE.substitute(
+            {"HClassName": f"{HClassName}", "SequenceType": f"{sequence_type}"}
+        )
+        # type hint
+        pyi_str += HSEQUENCE_TEMPLATE_PYI.substitute(
+            {"HClassName": f"{HClassName}", "SequenceType": f"{sequence_type}"}
+        )
     wrapper_str += "\n"
     pyi_str += "\n"
     return wrapper_str, pyi_str
 
 
-def process_handles(classes_dict, exclude_classes):
+def process_handles(context, classes_dict, exclude_classes):
     """Check whether a class has to be wrapped as a handle
     using the wrap_handle swig macro.
     This code is a bit redundant with process_classes, but this step
@@ -3117,7 +4453,7 @@ def process_handles(classes_dict, exclude_classes):
     wrap_handle_str = "/* handles */\n"
     if exclude_classes == ["*"]:  # don't wrap any class
         return ""
-    inheritance_tree_list = build_inheritance_tree(classes_dict)
+    inheritance_tree_list = get_inheritance_tree(context, classes_dict)
     for klass in inheritance_tree_list:
         # class name
         class_name = klass["name"]
@@ -3125,22 +4461,38 @@ def process_handles(classes_dict, exclude_classes):
             # if the class has to be excluded,
             # we go on with the next one to be processed
             continue
-        if check_has_related_handle(class_name) or class_name == "Standard_Transient":
+        if (
+            check_has_related_handle(context, class_name)
+            or class_name == "Standard_Transient"
+        ):
             wrap_handle_str += f"%wrap_handle({class_name})\n"
-    for HClassName in ALL_HARRAY1:
-        if HClassName.startswith(CURRENT_MODULE + "_"):
-            wrap_handle_str += f"%wrap_handle({HClassName})\n"
-    for HClassName in ALL_HARRAY2:
-        if HClassName.startswith(CURRENT_MODULE + "_"):
-            wrap_handle_str += f"%wrap_handle({HClassName})\n"
-    for HClassName in ALL_HSEQUENCE:
-        if HClassName.startswith(CURRENT_MODULE + "_"):
-            wrap_handle_str += f"%wrap_handle({HClassName})\n"
+    for HClassName in context.get_harray1():
+        wrap_handle_str += f"%wrap_handle({HClassName})\n"
+    for HClassName in context.get_harray2():
+        wrap_handle_str += f"%wrap_handle({HClassName})\n"
+    for HClassName in context.get_hsequence():
+        wrap_handle_str += f"%wrap_handle({HClassName})\n"
     wrap_handle_str += "/* end handles declaration */\n\n"
     return wrap_handle_str
 
 
-def process_classes(classes_dict, exclude_classes, exclude_member_functions):
+def get_excluded_classes(classes_dict, exclude_classes):
+    """Returns the list of classes to exclude. If exclude_classes is ["*"],
+    all classes from classes_dict are excluded
+    """
+    if exclude_classes != ["*"]:
+        return exclude_classes
+    # that is to say we add all classes to the list of exclude_member_functions
+    new_exclude_classes = []
+    for klass in classes_dict:
+        class_name_to_exclude = klass.split("::")[0]
+        class_name_to_exclude = class_name_to_exclude.split("<")[0]
+        if class_name_to_exclude not in new_exclude_classes:
+            new_exclude_classes.append(class_name_to_exclude)
+    return new_exclude_classes
+
+
+def process_classes(context, classes_dict, exclude_classes, exclude_member_functions):
     """Generate the SWIG string for the class wrapper.
     Works from a dictionary of all classes, generated with CppHeaderParser.
     All classes but the ones in exclude_classes are wrapped.
@@ -3148,27 +4500,22 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
     exclude_member_functions is a dict with classes names as keys and member
     function names as values
     """
-    global NB_TOTAL_CLASSES
-    if exclude_classes == ["*"]:  # don't wrap any class
-        # that is to say we add all classes to the list of exclude_member_functions
-        new_exclude_classes = []
-        for klass in classes_dict:
-            class_name_to_exclude = klass.split("::")[0]
-            class_name_to_exclude = class_name_to_exclude.split("<")[0]
-            if class_name_to_exclude not in new_exclude_classes:
-                new_exclude_classes.append(class_name_to_exclude)
-        exclude_classes = new_exclude_classes.copy()
-
-    class_def_str = ""  # the string for class definition
-    class_pyi_str = ""  # the string for class type hints
-
-    inheritance_tree_list = build_inheritance_tree(classes_dict)
+    exclude_classes = get_excluded_classes(classes_dict, exclude_classes)
+
+    # each class is wrapped in its own strings, joined at the end
+    class_def_fragments = []  # the strings for class definition
+    class_pyi_fragments = []  # the strings for class type hints
+    # the DumpJson/InitFromJson names found in the text of the classes
+    # wrapped so far
+    json_names = set()
+
+    inheritance_tree_list = get_inheritance_tree(context, classes_dict)
     for klass in inheritance_tree_list:
         # class name
         class_name = klass["name"]
         # header
-        stars = "".join(["*" for i in range(len(class_name) + 9)])
-        class_def_str += f"/{stars}\n* class {class_name} *\n{stars}/\n"
+        stars = "*" * (len(class_name) + 9)
+        class_def_fragments.append(f"/{stars}\n* class {class_name} *\n{stars}/\n")
         #
         if class_name in exclude_classes:
             # if the class has to be excluded,
@@ -3176,8 +4523,10 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
             continue
         # ensure the class returned by CppHeader is defined in this module
         # otherwise we go on with the next class
-        if not class_name.startswith(CURRENT_MODULE):
+        if not class_name.startswith(context.module_name):
             continue
+        class_def_str = ""
+        class_pyi_str = ""
         # we rename the class if the module is the same name
         # for instance TopoDS is both a module and a class
         # then we rename the class with lowercase
@@ -3185,7 +4534,7 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
         # the class type hint
         class_name_for_pyi = class_name.split("<")[0]
 
-        if class_name == CURRENT_MODULE:
+        if class_name == context.module_name:
             class_def_str += f"%rename({class_name.lower()}) {class_name};\n"
             class_name_for_pyi = class_name_for_pyi.lower()
         # then process the class itself
@@ -3201,7 +4550,7 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
         inherits_from = klass["inherits"]
         if inherits_from:  # at least 1 ancestor
             inheritance_name = inherits_from[0]["class"]
-            check_dependency(inheritance_name)
+            check_dependency(context, inheritance_name)
             inheritance_access = inherits_from[0]["access"]
             class_def_str += f" : {inheritance_access} {inheritance_name}"
             class_pyi_str += "("
@@ -3209,7 +4558,7 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
                 class_pyi_str += f"{inheritance_name}"
             if len(inherits_from) == 2:  ## 2 ancestors
                 inheritance_name_2 = inherits_from[1]["class"]
-                check_dependency(inheritance_name_2)
+                check_dependency(context, inheritance_name_2)
                 inheritance_access_2 = inherits_from[1]["access"]
                 class_def_str += f", {inheritance_access_2} {inheritance_name_2}"
                 class_pyi_str += f", {inheritance_name_2}"
@@ -3242,11 +4591,11 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
             class_def_str += "\t\tclass " + nested_class_name + " {};\n"
         ####### class enums
         if class_enums_list:
-            class_enum_def, _ = process_enums(class_enums_list)
+            class_enum_def, _ = process_enums(context, class_enums_list)
             class_def_str += class_enum_def
         # process class properties here
         properties_str = ""
-        if CURRENT_MODULE == "Graphic3d":
+        if context.module_name == "Graphic3d":
             for property_value in list(klass["properties"]["public"]):
                 # TODO : cppheaderparser fails at finding private class properties
                 if (
@@ -3300,31 +4649,17 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
         constructors, other_methods = methods_to_process
         # first constructors
         constructors_definitions, constructors_type_hints = process_constructors(
-            constructors
+            context, constructors
         )
         class_def_str += constructors_definitions
         class_pyi_str += constructors_type_hints
         # and the other methods
         other_method_definitions, other_method_type_hints = process_methods(
-            other_methods
+            context, other_methods
         )
         class_def_str += other_method_definitions
         class_pyi_str += other_method_type_hints
 
-        # after that change, we remove the "pass" if it appears to be unnecessary
-        # for example
-        # class gp_Ax22d:
-        #    pass
-        #    def Location
-        # should be
-        # class gp_Ax22d:
-        #    def Location
-        class_pyi_str = class_pyi_str.replace("pass\n    @overload", "@overload")
-        class_pyi_str = class_pyi_str.replace("pass\n    def", "def")
-        class_pyi_str = class_pyi_str.replace(
-            "pass\n    @staticmethod", "@staticmethod"
-        )
-
         # Important special case: For pickling of TopoDS_Shape, we do need WriteToString
         #                         and ReadFromString.
         if class_name == "BRepTools" or class_name == "BRepTools_ShapeSet":
@@ -3356,7 +4691,10 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
         # TODO: check that the following is not restricted
         # to protected destructors !
         class_def_str += "\n"
-        if check_has_related_handle(class_name) or class_name == "Standard_Transient":
+        if (
+            check_has_related_handle(context, class_name)
+            or class_name == "Standard_Transient"
+        ):
             # Extend class by GetHandle method
             class_def_str += f"%make_alias({class_name})\n\n"
         if class_name == "Standard_Transient":
@@ -3368,12 +4706,13 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
         if class_name == "ShapeAnalysis_FreeBounds":
             class_def_str += SHAPE_ANALYSIS_FREE_BOUNDS_TEMPLATE
             class_pyi_str += SHAPE_ANALYSIS_FREE_BOUNDS_TEMPLATE_PYI
-        # if shape can be serialized as a Json, both get/set, implement pickling
-        if (
-            "DumpJson" in class_def_str
-            and "InitFromJson" in class_def_str
-            and class_name != "TopoDS_Shape"
-        ):
+        # if shape can be serialized as a Json, both get/set, implement pickling.
+        # Both names are looked for in the text of the module so far, the
+        # classes wrapped before and this class
+        class_json_names = json_names.union(
+            name for name in ("DumpJson", "InitFromJson") if name in class_def_str
+        )
+        if len(class_json_names) == 2 and class_name != "TopoDS_Shape":
             class_def_str += GETSTATE_TEMPLATE.substitute({"CLASSNAME": class_name})
             class_def_str += SETSTATE_TEMPLATE.substitute({"CLASSNAME": class_name})
         # We add pickling for TopoDS_Shapes
@@ -3410,23 +4749,71 @@ def process_classes(classes_dict, exclude_classes, exclude_member_functions):
             )
         if class_name == "Geom_Surface":  # see ticket #1381, numpy support
             class_def_str += "// numpy support for Geom_Surface\nSurfaceArrayEvalExtend(Geom_Surface)\n\n"
-        # increment global number of classes
-        NB_TOTAL_CLASSES += 1
+        # after that change, we remove the "pass" if it appears to be unnecessary
+        # for example
+        # class gp_Ax22d:
+        #    pass
+        #    def Location
+        # should be
+        # class gp_Ax22d:
+        #    def Location
+        class_pyi_str = class_pyi_str.replace("pass\n    @overload", "@overload")
+        class_pyi_str = class_pyi_str.replace("pass\n    def", "def")
+        class_pyi_str = class_pyi_str.replace(
+            "pass\n    @staticmethod", "@staticmethod"
+        )
+        class_def_fragments.append(class_def_str)
+        json_names.update(
+            name for name in ("DumpJson", "InitFromJson") if name in class_def_str
+        )
+        class_pyi_fragments.append(class_pyi_str)
+        # increment the number of classes
+        context.nb_classes += 1
     #
     # Finally, we create a python proxy for each exclude class
     # to raise a python exception ClassNotWrapped
     # and we do the same in the stub file
     if exclude_classes:  # if the list is not empty
-        class_def_str += "/* python proxy for excluded classes */\n"
-        class_def_str += "%pythoncode {\n"
+        class_def_fragments.append("/* python proxy for excluded classes */\n")
+        class_def_fragments.append("%pythoncode {\n")
         for excluded_class in exclude_classes:
-            class_def_str += "@classnotwrapped\n"
-            class_def_str += f"class {excluded_class}:\n\tpass\n\n"
-            class_pyi_str += "\n#classnotwrapped\n"
-            class_pyi_str += f"class {excluded_class}: ...\n"
-        class_def_str += "}\n"
-        class_def_str += "/* end python proxy for excluded classes */\n"
-    return class_def_str, class_pyi_str
+            class_def_fragments.append("@classnotwrapped\n")
+            class_def_fragments.append(f"class {excluded_class}:\n\tpass\n\n")
+            class_pyi_fragments.append("\n#classnotwrapped\n")
+            class_pyi_fragments.append(f"class {excluded_class}: ...\n")
+        class_def_fragments.append("}\n")
+        class_def_fragments.append("/* end python proxy for excluded classes */\n")
+    return "".join(class_def_fragments), "".join(class_pyi_fragments)
+
+
+def test_process_classes_pickling():
+    # a class is pickled once both DumpJson and InitFromJson are in the
+    # text of the module classes wrapped so far, whether it defines them
+    # or not
+    header_content = """
+class Geom_A {};
+class Geom_B {
+public:
+    void DumpJson(Standard_OStream& theOStream, Standard_Integer theDepth = -1) const;
+};
+class Geom_C {
+public:
+    Standard_Boolean InitFromJson(const Standard_SStream& theSStream, Standard_Integer& theStreamPos);
+};
+class Geom_D {};
+"""
+    context = GenerationContext("Geom", Registries())
+    cpp_header = CppHeaderParser.CppHeader(
+        adapt_header_file(context, header_content), "string"
+    )
+    class_def_str, _ = process_classes(context, cpp_header.classes, [], {})
+    pickled_classes = [
+        class_name
+        for class_name in ["Geom_A", "Geom_B", "Geom_C", "Geom_D"]
+        if f"%extend {class_name} {{\n%pythoncode {{\n    def __getstate__"
+        in class_def_str
+    ]
+    assert pickled_classes == ["Geom_C", "Geom_D"]
 
 
 def process_deprecated(list_of_classes_methods):
@@ -3448,10 +4835,7 @@ def is_module(module_name):
     'Standard' should return True
     'inj' or whatever should return False
     """
-    for mod in OCCT_MODULES:
-        if mod[0] == module_name:
-            return True
-    return False
+    return module_name in MODULE_REGISTRY
 
 
 def test_is_module():
@@ -3459,38 +4843,72 @@ def test_is_module():
     assert is_module("something") is False
 
 
-def parse_module(module_name):
+def test_module_registry():
+    toolkits = [{"TKernel": ["Standard", "TCollection"]}]
+    module_registry = ModuleRegistry(
+        [
+            ("Standard", [], ["Standard_Failure"], {"Standard_Type": ["Print"]}),
+            ("TCollection", ["Standard"], []),
+            ("gp", [], []),
+        ],
+        toolkits,
+    )
+    assert list(module_registry) == ["Standard", "TCollection", "gp"]
+    assert module_registry.get("Standard").exclude_member_functions == {
+        "Standard_Type": ("Print",)
+    }
+    assert module_registry.get("TCollection").toolkit == "TKernel"
+    assert module_registry.get("gp").toolkit is None
+    try:
+        module_registry.get("something")
+        raise AssertionError("NameError expected")
+    except NameError:
+        pass
+    for occt_modules in (
+        [("Standard", [], []), ("Standard", [], []), ("TCollection", [], [])],
+        [("Standard", ["something"], []), ("TCollection", [], [])],
+        [("Standard", [], [])],
+    ):
+        try:
+            ModuleRegistry(occt_modules, toolkits)
+        except ValueError as error:
+            assert str(error).startswith("Invalid Modules.py")
+        else:
+            raise AssertionError(f"{occt_modules} should be invalid")
+
+
+def parse_module(context, measures):
     """A module is defined by a set of headers. For instance AIS,
     gp, BRepAlgoAPI etc. For each module, generate three or more
     SWIG files. This parser returns :
     module_enums, module_typedefs, module_classes
     """
-    module_headers = glob.glob(f"{OCCT_INCLUDE_DIR}/{module_name}_*.hxx")
-    module_headers += glob.glob(f"{OCCT_INCLUDE_DIR}/{module_name}.hxx")
-    module_headers.sort()
+    module_name = context.module_name
+    with measures.timer("header_discovery"):
+        include_dir_index = get_include_dir_index()
     # check if there are some files
-    if len(module_headers) == 0:
+    if not include_dir_index.get_module_headers(module_name):
         logging.warning(
             "No file for module %s. Please check that the module name is part of occt.",
             module_name,
         )
 
-    # filter those headers
-    module_headers = filter_header_list(module_headers, HXX_TO_EXCLUDE_FROM_CPPPARSER)
-    cpp_headers = map(parse_header, module_headers)
+    # headers CppHeaderParser can parse
+    module_headers = include_dir_index.get_headers_to_parse(module_name)
+    cpp_headers = (parse_header(context, header, measures) for header in module_headers)
     module_typedefs = {}
     module_enums = []
     module_classes = {}
     module_free_functions = []
-    for header in cpp_headers:
+    for typedefs, enums, classes, functions in cpp_headers:
         # build the typedef dictionary
-        module_typedefs.update(header.typedefs)
+        module_typedefs.update(typedefs)
         # build the enum list
-        module_enums += header.enums
+        module_enums += enums
         # build the class dictionary
-        module_classes.update(header.classes.items())
+        module_classes.update(classes.items())
         # build the free functions list
-        module_free_functions += header.functions
+        module_free_functions += functions
     return module_typedefs, module_enums, module_classes, module_free_functions
 
 
@@ -3501,76 +4919,82 @@ class ModuleWrapper:
         additional_dependencies,
         exclude_classes,
         exclude_member_functions,
+        context,
+        measures,
+        parsed_module=None,
     ):
-        # Reinit global variables
-        global CURRENT_MODULE, PYTHON_MODULE_DEPENDENCY, DEPRECATED_STATIC_FUNCTIONS
-        CURRENT_MODULE = module_name
-        DEPRECATED_STATIC_FUNCTIONS = []
-        # CURRENT_MODULE_PYI_STATIC_METHODS_ALIASES = ""
-        # all modules depend, by default, upon Standard, NCollection and others
-        if module_name not in ["Standard", "NCollection"]:
-            PYTHON_MODULE_DEPENDENCY = ["Standard", "NCollection"]
-            reset_header_depency()
-        else:
-            PYTHON_MODULE_DEPENDENCY = []
-
+        """context is the GenerationContext of the module, measures its
+        ModuleMeasures. parsed_module is the output of parse_module, if the
+        module headers were already parsed. Otherwise headers are parsed here.
+        """
         logging.info("## Processing module %s", module_name)
         self._module_name = module_name
+        self._context = context
+        self._measures = measures
         self._module_docstring = get_module_docstring(module_name)
         # parse
-        typedefs, enums, classes, free_functions = parse_module(module_name)
+        if parsed_module is None:
+            parsed_module = parse_module(context, measures)
+        typedefs, enums, classes, free_functions = parsed_module
         # enums
-        self._enums_str, self._enums_pyi_str = process_enums(enums)
+        with measures.timer("process_enums"):
+            self._enums_str, self._enums_pyi_str = process_enums(context, enums)
         # handles
-        self._wrap_handle_str = process_handles(classes, exclude_classes)
+        with measures.timer("process_handles"):
+            self._wrap_handle_str = process_handles(context, classes, exclude_classes)
         # templates and typedefs
-        (
-            self._typedefs_str,
-            self._typedefs_pyi_str,
-            self._typedef_aliases_str,
-        ) = process_typedefs(typedefs)
+        with measures.timer("process_typedefs"):
+            (
+                self._typedefs_str,
+                self._typedefs_pyi_str,
+                self._typedef_aliases_str,
+            ) = process_typedefs(context, typedefs)
         # classes
-        self._classes_str, self._classes_pyi_str = process_classes(
-            classes, exclude_classes, exclude_member_functions
-        )
+        with measures.timer("process_classes"):
+            self._classes_str, self._classes_pyi_str = process_classes(
+                context, classes, exclude_classes, exclude_member_functions
+            )
         # special classes for NCollection_HArray1, NCollection_HArray2 and NCollection_HSequence
-        harray1_def_str, harray1_pyi_str = process_harray1()
-        self._classes_str += harray1_def_str
-        self._classes_pyi_str += harray1_pyi_str
-
-        harray2_def_str, harray2_pyi_str = process_harray2()
-        self._classes_str += harray2_def_str
-        self._classes_pyi_str += harray2_pyi_str
-
-        hsequence_def_str, hsequence_pyi_str = process_hsequence()
-        self._classes_str += hsequence_def_str
-        self._classes_pyi_str += hsequence_pyi_str
+        with measures.timer("harray_hsequence"):
+            harray1_def_str, harray1_pyi_str = process_harray1(context)
+            harray2_def_str, harray2_pyi_str = process_harray2(context)
+            hsequence_def_str, hsequence_pyi_str = process_hsequence(context)
+        self._classes_str = "".join(
+            [self._classes_str, harray1_def_str, harray2_def_str, hsequence_def_str]
+        )
+        self._classes_pyi_str = "".join(
+            [self._classes_pyi_str, harray1_pyi_str, harray2_pyi_str, hsequence_pyi_str]
+        )
 
         # free functions
-        self._free_functions_str, self._free_functions_pyi_str = process_methods(
-            free_functions
-        )
+        with measures.timer("process_free_functions"):
+            self._free_functions_str, self._free_functions_pyi_str = process_methods(
+                context, free_functions
+            )
         # other dependencies
-        self._additional_dependencies = additional_dependencies + HEADER_DEPENDENCY
+        self._additional_dependencies = (
+            additional_dependencies + context.get_header_dependency()
+        )
 
         # deprecated static functions after move to swig-4.1.1
         self._deprecated_swig_static_functions_str = process_deprecated(
-            DEPRECATED_STATIC_FUNCTIONS
+            context.deprecated_static_functions
         )
 
         # generate swig file
-        self.generate_SWIG_files()
+        with measures.timer("write_files"):
+            self.changed_files = self.generate_SWIG_files()
 
     def generate_SWIG_files(self):
         #
         # The SWIG .i file
         #
+        # files are rendered in memory, and written only if they changed
+        changed_files = []
+        swig_interface_str = mod_header_str = ""
+        nb_module_headers = 0
         if GENERATE_SWIG_FILES:
-            swig_interface_file = open(
-                os.path.join(SWIG_OUTPUT_PATH, f"{self._module_name}.i"),
-                "w",
-                encoding="utf8",
-            )
+            swig_interface_file = io.StringIO()
             # write header
             swig_interface_file.write(LICENSE_HEADER)
             # write module docstring
@@ -3608,30 +5032,23 @@ class ModuleWrapper:
                     "#if defined(_WIN32)\n#include <windows.h>\n#endif\n"
                 )
 
-            module_headers = glob.glob(f"{OCCT_INCLUDE_DIR}/{self._module_name}_*.hxx")
-            module_headers += glob.glob(f"{OCCT_INCLUDE_DIR}/{self._module_name}.hxx")
-            module_headers.sort()
-
-            mod_header = open(
-                os.path.join(HEADERS_OUTPUT_PATH, f"{self._module_name}_module.hxx"),
-                "w",
-                encoding="utf8",
-            )
+            mod_header = io.StringIO()
             mod_header.write(LICENSE_HEADER)
             mod_header.write(f"#ifndef {self._module_name.upper()}_HXX\n")
             mod_header.write(f"#define {self._module_name.upper()}_HXX\n\n\n")
 
             if self._module_name == "XCAFDoc":
                 mod_header.write("#include<TDF_Label.hxx>\n")
-            for module_header in filter_header_list(
-                module_headers, HXX_TO_EXCLUDE_FROM_BEING_INCLUDED
-            ):
-                if (
-                    os.path.basename(module_header)
-                    not in HXX_TO_EXCLUDE_FROM_BEING_INCLUDED
-                ):
-                    mod_header.write(f"#include<{os.path.basename(module_header)}>\n")
+            for module_header in get_all_module_headers(self._module_name):
+                mod_header.write(f"#include<{module_header}>\n")
+                nb_module_headers += 1
             mod_header.write(f"\n#endif // {self._module_name.upper()}_HXX\n")
+            mod_header_filename = os.path.join(
+                HEADERS_OUTPUT_PATH, f"{self._module_name}_module.hxx"
+            )
+            mod_header_str = mod_header.getvalue()
+            if write_if_changed(mod_header_filename, mod_header_str):
+                changed_files.append(mod_header_filename)
             # Issue with opencascade TopoDSToStep_Builder.hxx header
             if self._module_name in ["TopoDSToStep", "StepToTopoDS"]:
                 swig_interface_file.write(f"#include<StepData_Factors.hxx>\n")
@@ -3640,13 +5057,13 @@ class ModuleWrapper:
             swig_interface_file.write(f"#include<{self._module_name}_module.hxx>\n")
             swig_interface_file.write("\n//Dependencies\n")
             # Include all dependencies
-            for dep in PYTHON_MODULE_DEPENDENCY:
+            for dep in self._context.python_module_dependency:
                 swig_interface_file.write(f"#include<{dep}_module.hxx>\n")
             for add_dep in self._additional_dependencies:
                 swig_interface_file.write(f"#include<{add_dep}_module.hxx>\n")
             # finally, use the current module namespace
-            if CURRENT_MODULE in ["TopoDS"]:
-                swig_interface_file.write(f"using namespace {CURRENT_MODULE};\n")
+            if self._module_name in ["TopoDS"]:
+                swig_interface_file.write(f"using namespace {self._module_name};\n")
 
             swig_interface_file.write("%};\n")
 
@@ -3661,7 +5078,7 @@ class ModuleWrapper:
             ]:
                 swig_interface_file.write(NUMPY_INIT_TEMPLATE)
 
-            for dep in PYTHON_MODULE_DEPENDENCY:
+            for dep in self._context.python_module_dependency:
                 if is_module(dep):
                     swig_interface_file.write(f"%import {dep}.i\n")
             #
@@ -3705,33 +5122,23 @@ class ModuleWrapper:
             # taking into account the TopoDS::Edge namespace rather than a class.
             if self._module_name == "TopoDS":
                 swig_interface_file.write(TOPODS_CLASS)
-            # then close the file
-            swig_interface_file.close()
-
-            # The EnumTemplates.i interface file, for all byref enums
-            enum_template_interface_file = open(
-                os.path.join(COMMON_OUTPUT_PATH, "EnumTemplates.i"),
-                "w",
-                encoding="utf8",
+            swig_interface_filename = os.path.join(
+                SWIG_OUTPUT_PATH, f"{self._module_name}.i"
             )
-            for enum_name in ALL_BYREF_ENUMS:
-                enum_template_interface_file.write(BYREF_ENUM_TEMPLATE % enum_name)
-            enum_template_interface_file.close()
+            swig_interface_str = swig_interface_file.getvalue()
+            if write_if_changed(swig_interface_filename, swig_interface_str):
+                changed_files.append(swig_interface_filename)
 
         #
         # write pyi stub file
         #
-        pyi_stub_file = open(
-            os.path.join(SWIG_OUTPUT_PATH, f"{self._module_name}.pyi"),
-            "w",
-            encoding="utf8",
-        )
+        pyi_stub_file = io.StringIO()
         # first write the header
         pyi_stub_file.write("from enum import IntEnum\n")
         pyi_stub_file.write("from typing import overload, NewType, Optional, Tuple\n\n")
 
-        # pyi_stub_file.write("from OCC.Core.%s import *\n" % CURRENT_MODULE)
-        for dep in PYTHON_MODULE_DEPENDENCY:
+        # pyi_stub_file.write("from OCC.Core.%s import *\n" % self._module_name)
+        for dep in self._context.python_module_dependency:
             if is_module(dep):
                 pyi_stub_file.write(f"from OCC.Core.{dep} import *\n")
         # we create NewTypes for some typedef which are just aliases. For instance, Prs3d_Presentation
@@ -3746,29 +5153,721 @@ class ModuleWrapper:
         if self._module_name == "TopoDS":
             pyi_stub_file.write(TOPODS_CLASS_PYI)
         # and we finally write the aliases for static methods
-        pyi_stub_file.close()
+        pyi_stub_filename = os.path.join(SWIG_OUTPUT_PATH, f"{self._module_name}.pyi")
+        pyi_stub_str = pyi_stub_file.getvalue()
+        if write_if_changed(pyi_stub_filename, pyi_stub_str):
+            changed_files.append(pyi_stub_filename)
+        self._measures.compile_cost = get_compile_cost(
+            self._context,
+            swig_interface_str,
+            pyi_stub_str,
+            mod_header_str,
+            nb_module_headers,
+        )
+        return changed_files
+
+
+# The SWIG and C++ compilation cost of a module grows with what its .i file
+# wraps and with the OCCT headers it includes. The estimated compile weight
+# sums these counts, weighted by their relative cost: a %template
+# instantiates a whole class wrapper, each included header is parsed by the
+# C++ compiler. The weights are rough, only the weights of the modules
+# relative to each other make sense
+COMPILE_COST_WEIGHTS = {
+    "nb_classes": 10.0,
+    "nb_methods": 1.0,
+    "nb_overloads": 1.0,
+    "nb_templates": 50.0,
+    "nb_extends": 2.0,
+    "nb_numpy_templates": 5.0,
+    "nb_headers": 2.0,
+    "swig_interface_kb": 0.5,
+}
 
+SWIG_TEMPLATE_PATTERN = re.compile(r"^\s*%template\(", re.MULTILINE)
+SWIG_EXTEND_PATTERN = re.compile(r"^\s*%extend\b", re.MULTILINE)
+# numpy typemaps, see common/numpy.i
+SWIG_NUMPY_TEMPLATE_PATTERN = re.compile(
+    r"^\s*%apply \([^)]*(?:IN|ARGOUT)_ARRAY\d", re.MULTILINE
+)
 
-def process_module(module_name):
-    all_modules = OCCT_MODULES
-    module_exist = False
-    for module in all_modules:
-        if module[0] == module_name:
-            module_exist = True
-            module_additionnal_dependencies = module[1]
-            module_exclude_classes = module[2]
-            if len(module) == 4:
-                modules_exclude_member_functions = module[3]
-            else:
-                modules_exclude_member_functions = {}
-            ModuleWrapper(
+
+def get_compile_cost(context, swig_interface, pyi_stub, module_header, nb_headers):
+    """The counts that drive the compilation cost of the module SWIG files,
+    and its estimated compile weight, see COMPILE_COST_WEIGHTS
+    """
+    compile_cost = {
+        "nb_classes": context.nb_classes,
+        "nb_methods": context.nb_methods,
+        "nb_overloads": context.nb_overloads,
+        "nb_templates": len(SWIG_TEMPLATE_PATTERN.findall(swig_interface)),
+        "nb_extends": len(SWIG_EXTEND_PATTERN.findall(swig_interface)),
+        "nb_numpy_templates": len(SWIG_NUMPY_TEMPLATE_PATTERN.findall(swig_interface)),
+        "nb_headers": nb_headers,
+        "swig_interface_kb": len(swig_interface.encode("utf8")) / 1024,
+        "pyi_stub_kb": len(pyi_stub.encode("utf8")) / 1024,
+        "module_header_kb": len(module_header.encode("utf8")) / 1024,
+    }
+    compile_cost["compile_weight"] = sum(
+        weight * compile_cost[name] for name, weight in COMPILE_COST_WEIGHTS.items()
+    )
+    return compile_cost
+
+
+def write_if_changed(filename, content):
+    """Write content to filename, only if the file content is different,
+    so that the pythonocc-core build is not triggered by unchanged files.
+    The file is replaced atomically. Returns True if the file was written
+    """
+    if os.path.isfile(filename):
+        with open(filename, "r", encoding="utf8") as existing_file:
+            if existing_file.read() == content:
+                return False
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp_filename, "w", encoding="utf8") as tmp_file:
+        tmp_file.write(content)
+    os.replace(tmp_filename, filename)
+    return True
+
+
+def write_enum_templates():
+    """The EnumTemplates.i interface file, for the byref enums of all modules,
+    sorted. The byref enums of the modules that were not processed by this
+    run are taken from the manifest.
+    """
+    if not GENERATE_SWIG_FILES:
+        return
+    byref_enums = set(REGISTRIES.byref_enums)
+    if MODULE_MANIFEST is not None:
+        byref_enums.update(MODULE_MANIFEST.get_byref_enums())
+    enum_template_interface_file = io.StringIO()
+    for enum_name in sorted(byref_enums):
+        enum_template_interface_file.write(BYREF_ENUM_TEMPLATE % enum_name)
+    enum_template_filename = os.path.join(COMMON_OUTPUT_PATH, "EnumTemplates.i")
+    if write_if_changed(
+        enum_template_filename, enum_template_interface_file.getvalue()
+    ):
+        CHANGED_FILES.append(enum_template_filename)
+
+
+class ModuleManifest:
+    """The record of the generated modules, stored next to the SWIG files.
+    A module is up to date if its headers, its OCCT_MODULES definition and
+    the generator did not change since it was generated, and if the registries
+    give the same answers to what the module read from them. Up to date
+    modules are not processed again, what they define is taken from the
+    manifest.
+    """
+
+    def __init__(self, manifest_filename, force=False):
+        self.manifest_filename = manifest_filename
+        # if True, no module is up to date
+        self.force = force
+        self.modules = {}
+        if os.path.isfile(manifest_filename):
+            try:
+                with open(manifest_filename, "r", encoding="utf8") as manifest_file:
+                    self.modules = json.load(manifest_file)
+            except json.JSONDecodeError:
+                logging.warning("Invalid manifest %s, ignored", manifest_filename)
+        with open(__file__, "r", encoding="utf8") as generator_file:
+            generator_source = generator_file.read()
+        all_module_names = sorted(MODULE_REGISTRY)
+        self._generator_hash = hashlib.sha256(
+            bytes(
+                generator_source + CppHeaderParser.__version__ + f"{all_module_names}",
+                encoding="utf8",
+            )
+        ).hexdigest()
+        self._fingerprints = {}
+        self.nb_up_to_date = 0
+
+    def get_fingerprint(self, module_name):
+        """The hash of the module headers, definition, and of the generator"""
+        if module_name in self._fingerprints:
+            return self._fingerprints[module_name]
+        fingerprint = hashlib.sha256(bytes(self._generator_hash, encoding="utf8"))
+        fingerprint.update(
+            bytes(f"{get_module_definition(module_name)}", encoding="utf8")
+        )
+        include_dir_index = get_include_dir_index()
+        module_headers = include_dir_index.get_module_headers(module_name) + [
+            header_filename
+            for header_filename in include_dir_index.get_module_headers("Handle")
+            if os.path.basename(header_filename).startswith(f"Handle_{module_name}_")
+        ]
+        for header_filename in module_headers:
+            fingerprint.update(bytes(os.path.basename(header_filename), "utf8"))
+            with open(header_filename, "rb") as header_file:
+                fingerprint.update(header_file.read())
+        self._fingerprints[module_name] = fingerprint.hexdigest()
+        return self._fingerprints[module_name]
+
+    def is_unchanged(self, module_name):
+        """True if the module inputs did not change since it was generated"""
+        if self.force or module_name not in self.modules:
+            return False
+        if self.modules[module_name]["fingerprint"] != self.get_fingerprint(
+            module_name
+        ):
+            return False
+        return all(
+            os.path.isfile(output_filename)
+            for output_filename in [
+                os.path.join(SWIG_OUTPUT_PATH, f"{module_name}.i"),
+                os.path.join(SWIG_OUTPUT_PATH, f"{module_name}.pyi"),
+                os.path.join(HEADERS_OUTPUT_PATH, f"{module_name}_module.hxx"),
+            ]
+        )
+
+    def is_up_to_date(self, context):
+        if not self.is_unchanged(context.module_name):
+            COUNTERS.count_lookup("module_manifest", False)
+            return False
+        consumed_facts = self.modules[context.module_name]["consumed_facts"]
+        # the facts are read again apart, they are not consumed by the
+        # module if it is processed again
+        check_context = GenerationContext(context.module_name, context.registries)
+        up_to_date = all(
+            check_context.lookup(registry_name, name) == answer
+            for registry_name, name, answer in consumed_facts
+        )
+        COUNTERS.count_lookup("module_manifest", up_to_date)
+        return up_to_date
+
+    def restore(self, context, measures):
+        """Restore what an up to date module defines, and its compile cost"""
+        logging.info("## Module %s is up to date", context.module_name)
+        module_entry = self.modules[context.module_name]
+        context.set_definitions(module_entry["definitions"])
+        measures.compile_cost = module_entry["compile_cost"]
+        self.nb_up_to_date += 1
+
+    def record(self, module_name, definitions, consumed_facts, compile_cost):
+        self.modules[module_name] = {
+            "fingerprint": self.get_fingerprint(module_name),
+            "definitions": definitions,
+            "compile_cost": compile_cost,
+            "consumed_facts": [
+                [registry_name, name, answer]
+                for (registry_name, name), answer in consumed_facts.items()
+            ],
+        }
+
+    def get_byref_enums(self):
+        """The byref enums of the recorded modules that are still defined
+        in OCCT_MODULES
+        """
+        return [
+            enum_name
+            for module_name, module_entry in self.modules.items()
+            if module_name in MODULE_REGISTRY
+            for enum_name in module_entry["definitions"]["byref_enums"]
+        ]
+
+    def save(self):
+        logging.info("Number of up to date modules: %s", self.nb_up_to_date)
+        tmp_filename = f"{self.manifest_filename}.tmp"
+        with open(tmp_filename, "w", encoding="utf8") as manifest_file:
+            json.dump(self.modules, manifest_file)
+        os.replace(tmp_filename, self.manifest_filename)
+
+
+# set by the main program, unless SWIG files are not generated
+MODULE_MANIFEST = None
+
+
+# set by the --trace command line option
+TRACE = False
+
+
+def set_trace(trace):
+    """Record the trace events of the modules if trace is True"""
+    global TRACE
+    TRACE = trace
+
+
+# set by the --profile command line option
+PROFILE_DIR = None
+
+
+def set_profile_dir(profile_dir):
+    """Profile the modules, the profiles are written to profile_dir"""
+    global PROFILE_DIR
+    PROFILE_DIR = profile_dir
+
+
+def get_rss():
+    """Returns the resident memory of the process in MB, None if unknown.
+    Falls back on the peak resident memory where /proc is not available
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="utf8") as statm_file:
+            nb_pages = int(statm_file.read().split()[1])
+        return nb_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return get_peak_rss()
+
+
+def get_peak_rss():
+    """Returns the peak resident memory of the process in MB, None if unknown"""
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KB elsewhere
+    return max_rss / 2**20 if sys.platform == "darwin" else max_rss / 2**10
+
+
+def set_memory_tracing(trace_memory):
+    """Trace the memory allocations, for the traced_peak memory of the
+    modules, if trace_memory is True. Tracing slows down the generation
+    """
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def run_worker(task_queue, result_queue, memory_budget, initargs):
+    """The worker processes of a WorkerPool: run the tasks of task_queue
+    until the None sentinel, and put their results in result_queue. If
+    memory_budget is not 0, a worker whose peak resident memory exceeds
+    memory_budget MB exits once the result of its task is put, and reports
+    its peak memory with the result
+    """
+    init_worker(*initargs)
+    for task_id, func, args in iter(task_queue.get, None):
+        try:
+            result = (True, func(*args))
+        except Exception as error:
+            result = (False, ExceptionWithTraceback(error, error.__traceback__))
+        peak_rss = get_peak_rss() if memory_budget else None
+        if peak_rss is not None and peak_rss > memory_budget:
+            result_queue.put((task_id, result, os.getpid(), peak_rss))
+            break
+        result_queue.put((task_id, result, os.getpid(), None))
+
+
+class WorkerResult:
+    """The result of a task run by a WorkerPool"""
+
+    def __init__(self, pool, task_id):
+        self._pool = pool
+        self._task_id = task_id
+
+    def get(self):
+        """Wait for the task result, the task exception is raised"""
+        return self._pool.get_result(self._task_id)
+
+
+class WorkerPool:
+    """The jobs worker processes of a parallel build, see run_worker. If
+    memory_budget is not 0, a worker whose peak resident memory exceeds
+    memory_budget MB once a task is done exits, and is replaced by a new
+    worker, so that there are never more than jobs workers
+    """
+
+    def __init__(self, jobs, memory_budget, initargs):
+        self.memory_budget = memory_budget
+        self.initargs = initargs
+        # the queues are fed by a thread, so that the main process does not
+        # wait for the workers to read a task while they wait for it to read
+        # their results
+        self._task_queue = multiprocessing.Queue()
+        self._result_queue = multiprocessing.Queue()
+        self._task_ids = itertools.count()
+        self._results = {}  # task id -> (success, value)
+        self._workers = {}  # pid -> process
+        for _ in range(jobs):
+            self._start_worker()
+
+    def _start_worker(self):
+        worker = multiprocessing.Process(
+            target=run_worker,
+            args=(
+                self._task_queue,
+                self._result_queue,
+                self.memory_budget,
+                self.initargs,
+            ),
+            daemon=True,
+        )
+        worker.start()
+        self._workers[worker.pid] = worker
+
+    def apply_async(self, func, args):
+        task_id = next(self._task_ids)
+        self._task_queue.put((task_id, func, args))
+        return WorkerResult(self, task_id)
+
+    def get_result(self, task_id):
+        """Wait for the result of the task. The workers that exited
+        over budget meanwhile are replaced
+        """
+        while task_id not in self._results:
+            try:
+                result_task_id, result, pid, peak_rss = self._result_queue.get(
+                    timeout=1
+                )
+            except queue.Empty:
+                for worker in self._workers.values():
+                    if not worker.is_alive():
+                        raise RuntimeError(
+                            f"Worker process {worker.pid} exited "
+                            f"with code {worker.exitcode}"
+                        )
+                continue
+            self._results[result_task_id] = result
+            if peak_rss is not None:
+                logging.info(
+                    "A worker used %.0f MB, more than the %s MB budget, "
+                    "it is replaced",
+                    peak_rss,
+                    self.memory_budget,
+                )
+                self._workers.pop(pid).join()
+                self._start_worker()
+        success, value = self._results.pop(task_id)
+        if not success:
+            raise value
+        return value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is not None:
+            for worker in self._workers.values():
+                worker.terminate()
+        else:
+            for _ in self._workers:
+                self._task_queue.put(None)
+        for worker in self._workers.values():
+            worker.join()
+
+
+class ModuleMeasures:
+    """The stage timings, trace events, memory, profiles and compile cost
+    of a module, reported by RunReport. What the generation depends on is
+    in the GenerationContext of the module
+    """
+
+    def __init__(self, module_name):
+        self.module_name = module_name
+        self.timings = {}  # stage name -> seconds, see timer
+        self.trace_events = []  # if the run is traced, see set_trace
+        self.memory = {}  # MB, see memory_tracker
+        self.profiles = []  # if the run is profiled, see profiler
+        self.compile_cost = {}  # see get_compile_cost
+
+    @contextlib.contextmanager
+    def timer(self, stage):
+        """Add the time spent in the with block to the stage timing,
+        and trace the stage if the run is traced
+        """
+        self.add_trace_event(stage, "B")
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = (
+                self.timings.get(stage, 0.0) + time.perf_counter() - start_time
+            )
+            self.add_trace_event(stage, "E")
+
+    def add_trace_event(self, name, phase):
+        """Record the beginning ("B") or the end ("E") of a trace event,
+        if the run is traced
+        """
+        if TRACE:
+            self.trace_events.append(
+                {
+                    "name": name,
+                    "ph": phase,
+                    "ts": time.perf_counter() * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_native_id(),
+                    "args": {"module": self.module_name},
+                }
+            )
+
+    @contextlib.contextmanager
+    def memory_tracker(self):
+        """Record the resident memory of the process after the with block,
+        not its peak, and the peak of the memory allocated in the with block
+        if the memory allocations are traced, see tracemalloc. The garbage
+        of what ran before is collected first, otherwise the peak depends on
+        when the garbage collector happens to run
+        """
+        if tracemalloc.is_tracing():
+            gc.collect()
+            start_memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            if tracemalloc.is_tracing():
+                _, peak_memory = tracemalloc.get_traced_memory()
+                self._add_memory("traced_peak", (peak_memory - start_memory) / 2**20)
+            if (rss := get_rss()) is not None:
+                self._add_memory("rss_after", rss)
+
+    def _add_memory(self, name, memory):
+        self.memory[name] = max(self.memory.get(name, 0.0), memory)
+
+    @contextlib.contextmanager
+    def profiler(self, part):
+        """Profile the with block if the run is profiled. The profile is
+        written to <module_name>.<part>.prof in the PROFILE_DIR directory,
+        the parts of a module are merged by RunReport.write_profiles
+        """
+        if PROFILE_DIR is None:
+            yield
+            return
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile_filename = os.path.join(
+                PROFILE_DIR, f"{self.module_name}.{part}.prof"
+            )
+            profile.dump_stats(profile_filename)
+            self.profiles.append(profile_filename)
+
+    def get(self):
+        """The measures, as sent by a worker process of a parallel build"""
+        return {
+            "timings": self.timings,
+            "trace_events": self.trace_events,
+            "memory": self.memory,
+            "profiles": self.profiles,
+            "compile_cost": self.compile_cost,
+        }
+
+    def add(self, measures):
+        """Add the measures of the module made in a worker process of
+        a parallel build. The counters of the worker are added to COUNTERS
+        """
+        for stage, stage_time in measures["timings"].items():
+            self.timings[stage] = self.timings.get(stage, 0.0) + stage_time
+        self.trace_events.extend(measures["trace_events"])
+        for name, memory in measures["memory"].items():
+            self._add_memory(name, memory)
+        self.profiles.extend(measures["profiles"])
+        self.compile_cost = measures["compile_cost"] or self.compile_cost
+        COUNTERS.add(measures["counters"])
+
+
+class RunReport:
+    """The stage timings and memory of the modules processed by a run,
+    written as a JSON report next to generator.log, with the totals by toolkit.
+    The trace events of a traced run are written in the Chrome trace
+    event format, see write_trace
+    """
+
+    def __init__(self):
+        self.modules = {}
+        self.trace_events = []
+        self.profiles = {}  # module name -> profile parts
+
+    def add_module(self, module_name, measures, up_to_date=False):
+        """measures are the ModuleMeasures of the module"""
+        module_entry = self.modules[module_name] = {
+            "toolkit": get_module_toolkit(module_name),
+            "up_to_date": up_to_date,
+            "timings": dict(measures.timings),
+            "memory": dict(measures.memory),
+            "compile_cost": measures.compile_cost,
+        }
+        # the one line summary of the module, in a compact log
+        logging.info(
+            "Module %s: %s classes, %s methods, %.3fs%s",
+            module_name,
+            module_entry["compile_cost"].get("nb_classes", 0),
+            module_entry["compile_cost"].get("nb_methods", 0),
+            sum(module_entry["timings"].values()),
+            ", up to date" if up_to_date else "",
+            extra={"generator_module": module_name, "module_summary": True},
+        )
+        self.trace_events.extend(measures.trace_events)
+        if measures.profiles:
+            self.profiles[module_name] = list(measures.profiles)
+
+    def get_report(self, total_time):
+        stages = {}
+        toolkits = {}
+        for module_name, module_entry in self.modules.items():
+            module_entry["total"] = sum(module_entry["timings"].values())
+            toolkit_entry = toolkits.setdefault(
+                module_entry["toolkit"],
+                {
+                    "nb_modules": 0,
+                    "timings": {},
+                    "total": 0.0,
+                    "memory": {},
+                    "compile_weight": 0.0,
+                },
+            )
+            toolkit_entry["nb_modules"] += 1
+            toolkit_entry["total"] += module_entry["total"]
+            for stage, stage_time in module_entry["timings"].items():
+                toolkit_entry["timings"][stage] = (
+                    toolkit_entry["timings"].get(stage, 0.0) + stage_time
+                )
+                stages[stage] = stages.get(stage, 0.0) + stage_time
+            toolkit_entry["compile_weight"] += module_entry["compile_cost"].get(
+                "compile_weight", 0.0
+            )
+            # peak memory of the toolkit modules
+            for name, memory in module_entry["memory"].items():
+                toolkit_entry["memory"][name] = max(
+                    toolkit_entry["memory"].get(name, 0.0), memory
+                )
+        return {
+            "total_time": total_time,
+            "stages": stages,
+            "toolkits": toolkits,
+            "modules": self.modules,
+            "counters": COUNTERS.get_counters(),
+        }
+
+    def write(self, report_filename, total_time):
+        with open(report_filename, "w", encoding="utf8") as report_file:
+            json.dump(self.get_report(total_time), report_file, indent=2)
+        logging.info("Timing report written to %s", report_filename)
+        self.log_compile_costs()
+
+    def log_compile_costs(self, nb_modules=10):
+        """Log the modules with the highest estimated compile weight"""
+        compile_costs = sorted(
+            (
+                (module_name, module_entry["compile_cost"])
+                for module_name, module_entry in self.modules.items()
+                if module_entry["compile_cost"]
+            ),
+            key=lambda item: item[1]["compile_weight"],
+            reverse=True,
+        )
+        if not compile_costs:
+            return
+        logging.info("Modules with the highest estimated compile weight:")
+        for module_name, compile_cost in compile_costs[:nb_modules]:
+            logging.info(
+                "    %s: %.0f (%s classes, %s methods, %s templates, "
+                "%s headers, %.0f KB)",
                 module_name,
-                module_additionnal_dependencies,
-                module_exclude_classes,
-                modules_exclude_member_functions,
+                compile_cost["compile_weight"],
+                compile_cost["nb_classes"],
+                compile_cost["nb_methods"],
+                compile_cost["nb_templates"],
+                compile_cost["nb_headers"],
+                compile_cost["swig_interface_kb"],
+            )
+
+    def write_trace(self, trace_filename):
+        """The trace can be opened in chrome://tracing or https://ui.perfetto.dev,
+        timestamps are in microseconds from the first event
+        """
+        start_ts = min((event["ts"] for event in self.trace_events), default=0.0)
+        trace_events = [
+            {**event, "ts": event["ts"] - start_ts} for event in self.trace_events
+        ]
+        # name the processes, the main process first
+        pids = sorted({event["pid"] for event in trace_events})
+        for pid in pids:
+            trace_events.append(
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "args": {"name": "main" if pid == os.getpid() else f"worker {pid}"},
+                }
+            )
+            trace_events.append(
+                {
+                    "name": "process_sort_index",
+                    "ph": "M",
+                    "pid": pid,
+                    "args": {"sort_index": -1 if pid == os.getpid() else pid},
+                }
+            )
+        with open(trace_filename, "w", encoding="utf8") as trace_file:
+            json.dump(
+                {"traceEvents": trace_events, "displayTimeUnit": "ms"}, trace_file
+            )
+        logging.info("Trace written to %s", trace_filename)
+
+    def write_profiles(self, profile_dir, nb_hotspots):
+        """Merge the profile parts of each module into <module_name>.prof,
+        and all modules into generator.prof. The nb_hotspots functions
+        with the highest cumulative time are logged
+        """
+        module_profiles = []
+        for module_name, profile_parts in self.profiles.items():
+            module_profile = os.path.join(profile_dir, f"{module_name}.prof")
+            pstats.Stats(*profile_parts).dump_stats(module_profile)
+            for profile_part in profile_parts:
+                os.remove(profile_part)
+            module_profiles.append(module_profile)
+        if not module_profiles:
+            return
+        generator_profile = os.path.join(profile_dir, "generator.prof")
+        pstats.Stats(*module_profiles).dump_stats(generator_profile)
+        hotspots = io.StringIO()
+        stats = pstats.Stats(generator_profile, stream=hotspots)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(nb_hotspots)
+        logging.info(
+            "Profiles of %s modules written to %s", len(module_profiles), profile_dir
+        )
+        logging.info(hotspots.getvalue())
+
+
+RUN_REPORT = RunReport()
+
+
+def process_module(module_name):
+    global NB_TOTAL_CLASSES, NB_TOTAL_METHODS
+    (
+        module_additionnal_dependencies,
+        module_exclude_classes,
+        modules_exclude_member_functions,
+    ) = get_module_definition(module_name)
+    context = GenerationContext(module_name, REGISTRIES)
+    measures = ModuleMeasures(module_name)
+    measures.add_trace_event(module_name, "B")
+    with module_logging(module_name), measures.profiler("module"):
+        with measures.timer("up_to_date_check"):
+            up_to_date = MODULE_MANIFEST is not None and (
+                MODULE_MANIFEST.is_up_to_date(context)
             )
-    if not module_exist:
-        raise NameError(f"Module {module_name} not defined")
+        if up_to_date:
+            MODULE_MANIFEST.restore(context, measures)
+        else:
+            index_current_module(module_name, measures)
+            with measures.memory_tracker():
+                module_wrapper = ModuleWrapper(
+                    module_name,
+                    module_additionnal_dependencies,
+                    module_exclude_classes,
+                    modules_exclude_member_functions,
+                    context,
+                    measures,
+                )
+            CHANGED_FILES.extend(module_wrapper.changed_files)
+            if MODULE_MANIFEST is not None:
+                MODULE_MANIFEST.record(
+                    module_name,
+                    context.get_definitions(),
+                    context.consumed_facts,
+                    measures.compile_cost,
+                )
+        REGISTRIES.register(context)
+        REGISTRIES.register_byref_enums(context.byref_enums)
+    measures.add_trace_event(module_name, "E")
+    RUN_REPORT.add_module(module_name, measures, up_to_date)
+    NB_TOTAL_CLASSES += context.nb_classes
+    NB_TOTAL_METHODS += context.nb_methods
+    log_requested_counters()
 
 
 def process_toolkit(toolkit_name):
@@ -3787,11 +5886,349 @@ def process_all_toolkits():
         process_toolkit(toolkit)
 
 
+def get_module_toolkit(module_name):
+    """Returns the name of the toolkit of the module, None if the module
+    is not part of a toolkit
+    """
+    if module_name not in MODULE_REGISTRY:
+        return None
+    return MODULE_REGISTRY.get(module_name).toolkit
+
+
+def get_all_modules():
+    """Returns the list of all modules, in the order they
+    are processed by process_all_toolkits
+    """
+    return [module for toolkit in TOOLKITS for module in sorted(TOOLKITS[toolkit])]
+
+
+def get_module_definition(module_name):
+    """Returns the additional dependencies, the classes to exclude and the
+    member functions to exclude of a module defined in OCCT_MODULES
+    """
+    module_definition = MODULE_REGISTRY.get(module_name)
+    return (
+        list(module_definition.dependencies),
+        list(module_definition.exclude_classes),
+        {
+            class_name: list(member_functions)
+            for class_name, member_functions in (
+                module_definition.exclude_member_functions.items()
+            )
+        },
+    )
+
+
+###################
+# Parallel build #
+###################
+# A module depends on the registries (enums, handles, transient classes etc.)
+# filled by the modules processed before. In a parallel build, the main process
+# fills these registries in the serial order, and each worker process gets the
+# registries the module would have found in a serial build.
+# The SWIG files are the same, whatever the number of processes.
+def parse_module_task(module_name):
+    """Worker process: parse the module headers. The handles and
+    harray/hsequence definitions found by adapt_header_file, and the
+    parsing measures, are returned together with the parsed module
+    """
+    context = GenerationContext(module_name, Registries())
+    measures = ModuleMeasures(module_name)
+    measures.add_trace_event(module_name, "B")
+    with module_logging(module_name), measures.profiler("parse"):
+        with measures.memory_tracker():
+            parsed_module = parse_module(context, measures)
+    measures.add_trace_event(module_name, "E")
+    parse_measures = measures.get()
+    parse_measures["counters"] = COUNTERS.pop()
+    return parsed_module, context.get_header_definitions(), parse_measures
+
+
+def generate_module_task(
+    module_name, parsed_module, header_definitions, registries_version
+):
+    """Worker process: generate the SWIG files for a parsed module, with
+    the registries of registries_version, see RegistriesLog.
+    Returns what the module defines, what it read from the registries,
+    the files that changed, the measures and the class index entries
+    indexed meanwhile
+    """
+    registries = REGISTRIES_REPLICA.get(registries_version)
+    context = GenerationContext(module_name, registries)
+    measures = ModuleMeasures(module_name)
+    measures.add_trace_event(module_name, "B")
+    context.add_header_definitions(header_definitions)
+    with module_logging(module_name), measures.profiler("generate"):
+        index_current_module(module_name, measures)
+        with measures.memory_tracker():
+            module_wrapper = ModuleWrapper(
+                module_name,
+                *get_module_definition(module_name),
+                context,
+                measures,
+                parsed_module,
+            )
+    measures.add_trace_event(module_name, "E")
+    generate_measures = measures.get()
+    generate_measures["counters"] = COUNTERS.pop()
+    return (
+        context.get_definitions(),
+        context.consumed_facts,
+        module_wrapper.changed_files,
+        generate_measures,
+        CLASS_INDEX.pop_new_entries() if CLASS_INDEX is not None else {},
+    )
+
+
+def register_module(module_name, parsed_module, header_definitions):
+    """Main process: fill the registries with what the module defines,
+    as processing the module would do in a serial build. Returns what the
+    module defines, see Registries.register_definitions
+    """
+    context = GenerationContext(module_name, REGISTRIES)
+    context.add_header_definitions(header_definitions)
+    _, enums, classes, _ = parsed_module
+    _, exclude_classes, _ = get_module_definition(module_name)
+    exclude_classes = get_excluded_classes(classes, exclude_classes)
+    # public enums, then enums of the wrapped classes
+    enum_names = [enum["name"] for enum in enums if "name" in enum]
+    for klass in build_inheritance_tree(context, classes):
+        class_name = klass["name"]
+        if class_name in exclude_classes or not class_name.startswith(module_name):
+            continue
+        enum_names += [
+            enum["name"] for enum in klass["enums"]["public"] if "name" in enum
+        ]
+    context.enums = dict.fromkeys(enum_names)
+    definitions = context.get_definitions()
+    REGISTRIES.register_definitions(definitions)
+    return definitions
+
+
+class RegistriesLog:
+    """The registries of a parallel build, shared with the worker processes
+    through a file: a snapshot of the registries, then what each module
+    defines, in the serial order. A worker process replays the file up to
+    the module it processes, see RegistriesReplica, so that the registries
+    are sent once to each worker rather than copied for each module
+    """
+
+    def __init__(self, registries):
+        log_file_descriptor, self.filename = tempfile.mkstemp(
+            prefix="generator_registries_"
+        )
+        self._log_file = os.fdopen(log_file_descriptor, "wb")
+        # the number of records, the version of the registries
+        self.version = 0
+        self.register_definitions(registries)
+
+    def register_definitions(self, definitions):
+        """Log what a module defines, once registered in the main process"""
+        pickle.dump(definitions, self._log_file, pickle.HIGHEST_PROTOCOL)
+        # the records are read by the workers once the module tasks are sent
+        self._log_file.flush()
+        self.version += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._log_file.close()
+        os.remove(self.filename)
+
+
+class RegistriesReplica:
+    """The copy of the registries of a worker process, see RegistriesLog.
+    The modules are processed in the serial order, so the copy only moves
+    forward
+    """
+
+    def __init__(self, filename):
+        self._log_file = open(filename, "rb")
+        self.registries = None
+        self.version = 0
+
+    def get(self, version):
+        """The registries once the version first records are replayed"""
+        if version < self.version:
+            raise RuntimeError(
+                f"Registries version {version} requested, "
+                f"the replica is at version {self.version}"
+            )
+        while self.version < version:
+            record = pickle.load(self._log_file)
+            if self.registries is None:
+                self.registries = record
+            else:
+                self.registries.register_definitions(record)
+            self.version += 1
+        return self.registries
+
+
+# set in the worker processes of a parallel build
+REGISTRIES_REPLICA = None
+
+
+def set_registries_log(registries_log_filename):
+    """Replay the registries log of the main process, if not None"""
+    global REGISTRIES_REPLICA
+    REGISTRIES_REPLICA = (
+        RegistriesReplica(registries_log_filename)
+        if registries_log_filename is not None
+        else None
+    )
+
+
+def init_worker(
+    parse_cache,
+    class_index,
+    type_adaptation_cache,
+    trace,
+    trace_memory,
+    profile_dir,
+    log_queue,
+    module_log_dir,
+    registries_log_filename,
+):
+    """The initializer of the parallel build worker processes"""
+    if log_queue is not None:
+        set_log_queue(log_queue, module_log_dir)
+    set_registries_log(registries_log_filename)
+    set_parse_cache(parse_cache)
+    set_class_index(class_index)
+    set_type_adaptation_cache(type_adaptation_cache)
+    set_trace(trace)
+    set_memory_tracing(trace_memory)
+    set_profile_dir(profile_dir)
+    # the counters of the main process are inherited by forked workers
+    COUNTERS.pop()
+
+
+def process_modules_in_parallel(modules_list, jobs, memory_budget=0):
+    """Generate wrappers for a list of modules, using a pool of jobs
+    worker processes. The workers are replaced once one of them uses more
+    than memory_budget MB, if not 0, see WorkerPool
+    """
+    global NB_TOTAL_CLASSES, NB_TOTAL_METHODS
+    # raise before starting anything if a module is not defined
+    for module_name in modules_list:
+        get_module_definition(module_name)
+    logging.info("Processing %s modules with %s processes", len(modules_list), jobs)
+    modules_to_parse = iter(modules_list)
+    if memory_budget:
+        logging.info("Worker memory budget: %s MB", memory_budget)
+    with RegistriesLog(REGISTRIES) as registries_log, WorkerPool(
+        jobs,
+        memory_budget,
+        initargs=(
+            PARSE_CACHE,
+            CLASS_INDEX,
+            TYPE_ADAPTATION_CACHE,
+            TRACE,
+            tracemalloc.is_tracing(),
+            PROFILE_DIR,
+            LOG_QUEUE,
+            MODULE_LOG_DIR,
+            registries_log.filename,
+        ),
+    ) as pool:
+
+        def parse_in_advance(module_name):
+            # modules that did not change are likely to be up to date,
+            # they are parsed only if they are not
+            if MODULE_MANIFEST is not None and MODULE_MANIFEST.is_unchanged(
+                module_name
+            ):
+                return None
+            return pool.apply_async(parse_module_task, (module_name,))
+
+        # only a few modules are parsed in advance,
+        # parsed modules are memory consuming
+        parse_results = deque(
+            (module_name, parse_in_advance(module_name))
+            for module_name in itertools.islice(modules_to_parse, 2 * jobs)
+        )
+        generate_results = []
+        while parse_results:
+            log_requested_counters()
+            module_name, parse_result = parse_results.popleft()
+            next_module_name = next(modules_to_parse, None)
+            if next_module_name is not None:
+                parse_results.append(
+                    (next_module_name, parse_in_advance(next_module_name))
+                )
+            context = GenerationContext(module_name, REGISTRIES)
+            measures = ModuleMeasures(module_name)
+            with measures.timer("up_to_date_check"):
+                up_to_date = MODULE_MANIFEST is not None and (
+                    MODULE_MANIFEST.is_up_to_date(context)
+                )
+            if up_to_date:
+                MODULE_MANIFEST.restore(context, measures)
+                definitions = context.get_definitions()
+                REGISTRIES.register_definitions(definitions)
+                registries_log.register_definitions(definitions)
+                generate_results.append((module_name, None, context, measures))
+                continue
+            if parse_result is None:
+                parse_result = pool.apply_async(parse_module_task, (module_name,))
+            parsed_module, header_definitions, parse_measures = parse_result.get()
+            measures.add(parse_measures)
+            # the module is processed with the registries before it registers
+            registries_version = registries_log.version
+            with measures.timer("register_module"):
+                definitions = register_module(
+                    module_name, parsed_module, header_definitions
+                )
+                registries_log.register_definitions(definitions)
+            generate_result = pool.apply_async(
+                generate_module_task,
+                (module_name, parsed_module, header_definitions, registries_version),
+            )
+            generate_results.append((module_name, generate_result, context, measures))
+        # byref enums are gathered in the serial order
+        for module_name, generate_result, context, measures in generate_results:
+            log_requested_counters()
+            up_to_date = generate_result is None
+            if up_to_date:
+                definitions = context.get_definitions()
+            else:
+                (
+                    definitions,
+                    consumed_facts,
+                    changed_files,
+                    generate_measures,
+                    class_index_entries,
+                ) = generate_result.get()
+                measures.add(generate_measures)
+                if CLASS_INDEX is not None:
+                    CLASS_INDEX.add_entries(class_index_entries)
+                CHANGED_FILES.extend(changed_files)
+                if MODULE_MANIFEST is not None:
+                    MODULE_MANIFEST.record(
+                        module_name,
+                        definitions,
+                        consumed_facts,
+                        measures.compile_cost,
+                    )
+            RUN_REPORT.add_module(module_name, measures, up_to_date)
+            REGISTRIES.register_byref_enums(definitions["byref_enums"])
+            NB_TOTAL_CLASSES += definitions["nb_classes"]
+            NB_TOTAL_METHODS += definitions["nb_methods"]
+
+
 def run_unit_tests():
     test_is_module()
+    test_module_registry()
     test_filter_header_list()
     test_get_all_module_headers()
+    test_adapt_header_file()
+    test_class_index()
+    test_process_classes_pickling()
+    test_get_class_module()
     test_adapt_return_type()
+    test_type_adaptation_cache()
+    test_type_adaptation_cache_switch()
     test_filter_typedefs()
     test_adapt_function_name()
     test_adapt_param_type_and_name()
@@ -3801,18 +6238,169 @@ def run_unit_tests():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate the pythonocc-core SWIG interface files"
+    )
+    parser.add_argument(
+        "modules", nargs="*", help="modules to process, all modules if omitted"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="number of worker processes, overrides the [build] parallel_build setting",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="don't use the parsed headers cache"
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="empty the parsed headers cache before processing",
+    )
+    parser.add_argument(
+        "--no-class-index",
+        action="store_true",
+        help="don't use the class index, what the modules depend on is only "
+        "known from the modules processed before",
+    )
+    parser.add_argument(
+        "--no-type-adaptation-cache",
+        action="store_true",
+        help="don't memoize the type adaptations, the generated files are the "
+        "same but the generation is slower",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="process all modules, even the ones that are up to date",
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="TRACE_FILE",
+        help="write the modules and stages timeline to TRACE_FILE, "
+        "in the Chrome trace event format",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="trace the memory allocations, for the peak memory of the modules "
+        "in the timing report. Slows down the generation",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        metavar="MB",
+        type=int,
+        default=WORKER_MEMORY_BUDGET,
+        help="replace a worker process once its peak memory exceeds MB MB, "
+        "overrides the [build] worker_memory_budget setting. 0 for no budget",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PROFILE_DIR",
+        help="profile each module, the cProfile profiles of the modules and "
+        "the merged generator.prof profile are written to PROFILE_DIR",
+    )
+    parser.add_argument(
+        "--profile-hotspots",
+        metavar="N",
+        type=int,
+        default=30,
+        help="number of functions with the highest cumulative time logged "
+        "at the end of a profiled run, 30 by default",
+    )
+    parser.add_argument(
+        "--compact-log",
+        action="store_true",
+        help="log one summary line by module, the log of each module is written "
+        "to the logs directory, next to generator.log",
+    )
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.memory_budget < 0:
+        parser.error("--memory-budget must not be negative")
+    if args.jobs is not None:
+        nb_jobs = args.jobs
+    elif PARALLEL_BUILD:
+        nb_jobs = os.cpu_count()
+    else:
+        nb_jobs = 1
+    start_log_listener(args.compact_log)
+    parse_cache = ParseCache(PARSE_CACHE_DIR, PARSE_CACHE_SIZE)
+    if args.clear_cache:
+        parse_cache.clear()
     # do it each time, does not take too much time, prevent regressions
     run_unit_tests()
+    # what the unit tests read and cached is not counted
+    COUNTERS.pop()
+    if not args.no_cache:
+        set_parse_cache(parse_cache)
+    elif not args.no_class_index:
+        # the headers parsed for the class index are parsed by the modules
+        # too, they are only cached for the run
+        run_cache_dir = tempfile.mkdtemp(prefix="generator_parse_cache_")
+        atexit.register(shutil.rmtree, run_cache_dir, ignore_errors=True)
+        set_parse_cache(ParseCache(run_cache_dir, PARSE_CACHE_SIZE))
+    set_type_adaptation_cache(not args.no_type_adaptation_cache)
+    set_trace(args.trace is not None)
+    set_memory_tracing(args.memory)
+    if hasattr(signal, "SIGUSR1"):  # not on Windows
+        signal.signal(signal.SIGUSR1, request_counters_log)
+    if args.profile is not None:
+        os.makedirs(args.profile, exist_ok=True)
+        set_profile_dir(os.path.abspath(args.profile))
+    if GENERATE_SWIG_FILES:
+        MODULE_MANIFEST = ModuleManifest(
+            os.path.join(SWIG_OUTPUT_PATH, "generator_manifest.json"), args.force
+        )
     logging.info(get_log_header())
     start_time = time.perf_counter()
-    if len(sys.argv) > 1:
-        for module_to_process in sys.argv[1:]:
+    if not args.no_class_index:
+        # the class index is neither read nor stored if the cache is disabled
+        class_index_filename = (
+            os.path.join(PARSE_CACHE_DIR, "class_index.json")
+            if not args.no_cache
+            else None
+        )
+        set_class_index(get_class_index(class_index_filename))
+    if nb_jobs > 1:
+        process_modules_in_parallel(
+            args.modules or get_all_modules(), nb_jobs, args.memory_budget
+        )
+    elif args.modules:
+        for module_to_process in args.modules:
             process_module(module_to_process)
     else:
         process_all_toolkits()
+    write_enum_templates()
     end_time = time.perf_counter()
     total_time = end_time - start_time
+    if not args.no_cache:
+        PARSE_CACHE.evict()
+    if CLASS_INDEX is not None:
+        logging.info("Class index: %s modules indexed", len(CLASS_INDEX.new_entries))
+        if CLASS_INDEX.new_entries and class_index_filename is not None:
+            CLASS_INDEX.save(class_index_filename)
+    if MODULE_MANIFEST is not None:
+        MODULE_MANIFEST.save()
+    COUNTERS.log()
     # footer
     logging.info(get_log_footer(total_time))
     logging.info("Number of classes: %s", NB_TOTAL_CLASSES)
     logging.info("Number of methods: %s", NB_TOTAL_METHODS)
+    logging.info("Number of changed files: %s", len(CHANGED_FILES))
+    # a compact log doesn't list them
+    if not args.compact_log:
+        for changed_file in CHANGED_FILES:
+            logging.info(
+                "    %s",
+                os.path.relpath(changed_file, os.path.dirname(SWIG_OUTPUT_PATH)),
+            )
+    RUN_REPORT.write(
+        os.path.join(SWIG_OUTPUT_PATH, "generator_report.json"), total_time
+    )
+    if args.trace is not None:
+        RUN_REPORT.write_trace(args.trace)
+    if args.profile is not None:
+        RUN_REPORT.write_profiles(PROFILE_DIR, args.profile_hotspots)